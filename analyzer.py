@@ -1,22 +1,54 @@
-import nltk
-
-import nltk
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet, words as nltk_words
-from nltk import pos_tag, word_tokenize
-nltk.download('wordnet')
-from nltk.stem import WordNetLemmatizer
-nltk.download('averaged_perceptron_tagger_eng')
-import nltk
-from nltk import pos_tag, word_tokenize
+import threading
 from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer
-# Add this line to download the required resource
-nltk.download('punkt')
-nltk.download('punkt_tab')
+from nltk.tag.perceptron import PerceptronTagger
+from nltk.tokenize import NLTKWordTokenizer
+from nltk.tokenize.punkt import PunktTokenizer
+import nltk_setup
+
+# Kaynaklar 'python nltk_setup.py' ile bir kez kurulur; burada yalnızca yerel kontrol yapılır
+nltk_setup.ensure_resources()
 
 #Bu modül verilen kelimenin türünü (sıfat ,isim, fiil vb.) analiz eder
 
+# Tokenizer, tagger ve lemmatizer süreç başına bir kez oluşturulur.
+# nltk.pos_tag her çağrıda PerceptronTagger'ı (ve ağırlıklarını) yeniden yükler; burada bir kez yüklenir.
+# Nesneler yüklendikten sonra salt okunur kullanılır, thread'ler arasında paylaşılabilir.
+_models = {}
+_model_locks = {name: threading.Lock() for name in ("sent_tokenizer", "word_tokenizer", "tagger", "lemmatizer")}
+
+
+def _get_model(name, factory):
+    model = _models.get(name)
+    if model is None:
+        with _model_locks[name]:
+            model = _models.get(name)
+            if model is None:
+                model = factory()
+                _models[name] = model
+    return model
+
+
+def _load_lemmatizer():
+    # WordNet'in tembel yüklemesi thread-safe değil; kilit altında bir kez yüklenir
+    wordnet.ensure_loaded()
+    return WordNetLemmatizer()
+
+
+def get_tagger():
+    return _get_model("tagger", PerceptronTagger)
+
+
+def get_lemmatizer():
+    return _get_model("lemmatizer", _load_lemmatizer)
+
+
+def tokenize(sentence: str):
+    """nltk.word_tokenize ile aynı çıktı: önce cümlelere (punkt), sonra kelimelere (treebank) ayırır."""
+    sent_tokenizer = _get_model("sent_tokenizer", PunktTokenizer)
+    word_tokenizer = _get_model("word_tokenizer", NLTKWordTokenizer)
+    return [tok for sent in sent_tokenizer.tokenize(sentence) for tok in word_tokenizer.tokenize(sent)]
+
 
 
 def simplify_pos(tag: str) -> str:
@@ -78,12 +110,51 @@ def refine_tags(tokens, tagged):
 
 
 def analyze_word_in_sentence(word: str, sentence: str):
-    tokens = word_tokenize(sentence)
-    tagged = pos_tag(tokens)
+    tokens = tokenize(sentence)
+    tagged = get_tagger().tag(tokens)
 
     # refine
     tagged = refine_tags(tokens, tagged)
 
+    return _analyze_tagged(word, tokens, tagged, _lemmatize)
+
+
+def analyze_many(pairs):
+    """
+    Çok sayıda (kelime, cümle) çiftini toplu analiz eder; sonuçlar girdi sırasıyla döner.
+    Aynı cümleler bir kez tokenize edilir, tüm cümleler tek tag_sents çağrısıyla etiketlenir,
+    aynı (token, etiket) için lemma bir kez hesaplanır.
+    """
+    pairs = list(pairs)
+    sentences = list(dict.fromkeys(sentence for _, sentence in pairs))
+    token_lists = [tokenize(sentence) for sentence in sentences]
+    tagged_lists = get_tagger().tag_sents(token_lists)
+
+    analyzed = {
+        sentence: (tokens, refine_tags(tokens, tagged))
+        for sentence, tokens, tagged in zip(sentences, token_lists, tagged_lists)
+    }
+
+    lemmas = {}
+
+    def lemmatize_cached(tok, tag):
+        key = (tok, tag)
+        if key not in lemmas:
+            lemmas[key] = _lemmatize(tok, tag)
+        return lemmas[key]
+
+    return [_analyze_tagged(word, *analyzed[sentence], lemmatize_cached) for word, sentence in pairs]
+
+
+def _lemmatize(tok, tag):
+    wnl = get_lemmatizer()
+    wn_pos = to_wordnet_pos(tag)
+    if wn_pos:
+        return wnl.lemmatize(tok, pos=wn_pos)
+    return wnl.lemmatize(tok)
+
+
+def _analyze_tagged(word, tokens, tagged, lemmatize):
     # hedef kelimeyi bul
     target_lower = word.lower()
     match_idx = None
@@ -105,12 +176,7 @@ def analyze_word_in_sentence(word: str, sentence: str):
     simple = simplify_pos(tag)
 
     # Lemma
-    wnl = WordNetLemmatizer()
-    wn_pos = to_wordnet_pos(tag)
-    if wn_pos:
-        lemma = wnl.lemmatize(tok, pos=wn_pos)
-    else:
-        lemma = wnl.lemmatize(tok)
+    lemma = lemmatize(tok, tag)
 
     return {
         "token": tok,
@@ -118,4 +184,4 @@ def analyze_word_in_sentence(word: str, sentence: str):
         "pos_tag": tag,
         "pos": simple,
         "lemma": lemma
-    }
\ No newline at end of file
+    }
@@ -1,18 +1,64 @@
-from flask import render_template, request, jsonify, session, redirect, url_for
+from dotenv import load_dotenv
+
+# Modüller ayarlarını import anında os.getenv ile okur; .env bunlardan önce yüklenmeli
+load_dotenv()
+
+from flask import render_template, request, jsonify, session, redirect, url_for, Response, stream_with_context
 from database import Database
+import hashlib
+import io
+import json
+import os
 import secrets
 import generator
+import importer
+import precompute
 import sound
+import warmup
 from flask import Flask
-from dotenv import load_dotenv
 import email_service
 
+
+def _stable_secret_key():
+    """
+    Session anahtarı: SECRET_KEY ortam değişkeni, yoksa diskte saklanan anahtar (ilk açılışta üretilir).
+    Tüm worker süreçleri ve yeniden başlatmalar aynı anahtarı kullanır; oturumlar düşmez.
+    """
+    key = os.getenv("SECRET_KEY")
+    if key:
+        return key
+    path = os.getenv("SECRET_KEY_FILE", ".secret_key")
+    if not os.path.exists(path):
+        # Geçici dosyaya yazıp link ile atomik olarak yerleştir; aynı anda açılan süreçlerden yalnızca biri kazanır
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+    with open(path) as f:
+        return f.read().strip()
+
+
 app = Flask(__name__)
-app.secret_key = secrets.token_hex(16)  # Session için güvenli key
-load_dotenv()
+app.secret_key = _stable_secret_key()  # Session için güvenli key
 # Veritabanı bağlantısı
 db = Database()
 
+# /api/pronounce yanıtlarının tarayıcı önbelleğinde kalma süresi (saniye)
+AUDIO_MAX_AGE = int(os.getenv("AUDIO_MAX_AGE", 7 * 24 * 3600))
+
+# /api/pronounce/batch isteğinde kabul edilen en fazla metin sayısı
+PRONOUNCE_BATCH_LIMIT = int(os.getenv("PRONOUNCE_BATCH_LIMIT", 100))
+
+# Çeviri, TTS, tagger ve WordNet modellerini arka planda paralel yükle (/healthz/ready bunu izler)
+if os.getenv("WARMUP_ON_START", "1") == "1":
+    warmup.start_background()
+
 # Eski, kullanılmayan sözlük/veri bölümleri kaldırıldı
 
 # Hobi kategorileri
@@ -45,30 +91,42 @@ def words_page():
     if 'user_id' not in session:
         return redirect(url_for('login'))
 
-    # query parametreleri
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 50))
+    # query parametreleri (after/before: önceki/sonraki sayfa cursor'ları)
+    per_page = min(max(int(request.args.get('per_page', 50)), 1), 200)
     q = request.args.get('q', '')
 
-    offset = (page - 1) * per_page
-
-    # list_user_words(user_id, limit, offset, search)
-    words = db.list_user_words(
+    result = db.list_user_words_page(
         session['user_id'],
-        limit=per_page,
-        offset=offset,
-        search=q if q else None
+        per_page=per_page,
+        search=q if q else None,
+        after=request.args.get('after'),
+        before=request.args.get('before')
     )
 
     return render_template(
         'words.html',
         user=session.get('user'),
-        words=words,
-        page=page,
+        words=result["words"],
+        next_cursor=result["next_cursor"],
+        prev_cursor=result["prev_cursor"],
         per_page=per_page,
         q=q
     )
 
+@app.route('/healthz/ready')
+def healthz_ready():
+    """Load balancer için: tüm modeller yüklenene kadar 503 döner"""
+    ready = warmup.is_ready()
+    return jsonify({"ready": ready, "models": warmup.report()}), (200 if ready else 503)
+
+@app.route('/metrics/cache')
+def metrics_cache():
+    """Çeviri ve üretim önbelleklerinin hit/miss istatistikleri"""
+    return jsonify({
+        "translation": generator.translate.translation_cache.stats(),
+        "generation": generator.generation_cache.stats(),
+    })
+
 @app.route('/dashboard')
 def dashboard():
     if 'user_id' not in session:
@@ -130,6 +188,8 @@ def api_generate():
     data = request.get_json(force=True)
     word = data.get("word", "").strip()
     sample_sentence = data.get("sample_sentence", "").strip()
+    # "fresh": true => önbellekteki sonucu kullanma, yeni örnekler üret
+    fresh = bool(data.get("fresh", False))
 
     if not word or not sample_sentence:
         return jsonify({"success": False, "error": "Kelime ve örnek cümle gerekli"})
@@ -147,12 +207,14 @@ def api_generate():
 
     try:
         print(f"Starting generation for word: {word}, interests: {interests}")
-        info, examples = generator.generate_sentences(word, sample_sentence, tenses, interests)
+        info, examples = generator.generate_sentences(word, sample_sentence, tenses, interests, fresh=fresh)
         print(f"Generation successful - info: {info}, examples count: {len(examples) if examples else 0}")
         normalized_word = word.casefold()
         db_result=db.add_word_entry(user_id=session["user_id"], word=normalized_word)
         if db_result:
             print("Kelime sözlüğe kaydedildi")
+        # Kullanıcı birazdan "Seslendir"e basacak: kelime ve örneklerin seslerini arka planda hazırla
+        precompute.schedule_entry(normalized_word, info, examples)
         return jsonify({"info": info, "examples": examples})
     except Exception as e:
         print(f"Error generating sentences: {e}")
@@ -318,6 +380,48 @@ def api_get_hobby_words(hobby):
     return jsonify({"success": True, "words": words})
 
 
+@app.route('/api/words/suggest')
+def api_suggest_words():
+    """Arama kutusu için önek otomatik tamamlama (kullanıcının kendi kelimeleri)"""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Giriş yapmanız gerekli"})
+
+    q = request.args.get('q', '')
+    limit = min(max(int(request.args.get('limit', 10)), 1), 20)
+    suggestions = db.suggest_user_words(session['user_id'], q, limit)
+    return jsonify({"success": True, "suggestions": suggestions})
+
+
+@app.route('/api/words/import', methods=['POST'])
+def api_import_words():
+    """
+    Toplu kelime içe aktarma. Dosya 'file' alanıyla (multipart) ya da ham gövde olarak gönderilir.
+    format: csv | clippings (verilmezse dosya adından tahmin edilir).
+    İlerleme satır satır JSON (NDJSON) olarak akıtılır.
+    """
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Giriş yapmanız gerekli"})
+
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    fmt = request.args.get('format') or importer.detect_format(upload.filename if upload else None)
+    if fmt not in importer.PARSERS:
+        return jsonify({"success": False, "error": "Desteklenmeyen format"})
+
+    user_id = session['user_id']
+    lines = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    def generate():
+        try:
+            for progress in importer.import_words(db, user_id, importer.PARSERS[fmt](lines)):
+                yield json.dumps(progress) + "\n"
+        except Exception as e:
+            print(f"Import error: {e}")
+            yield json.dumps({"success": False, "error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 ## Kullanıcı hatırlatmaları sistem tarafından otomatik güncellenir; manuel API kaldırıldı.
 
 @app.route('/api/word/attempt', methods=['POST'])
@@ -349,15 +453,94 @@ def api_pronounce():
     if not text:
         return jsonify({"success": False, "error": "Seslendirilecek metin boş olamaz"})
 
+    return _audio_response(text, data.get('format'))
+
+
+@app.route('/api/pronounce', methods=['GET'])
+def api_pronounce_get():
+    """Tarayıcı tarafından önbelleklenebilir varyant: /api/pronounce?text=...&format=flac"""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Giriş yapmanız gerekli"})
+
+    text = request.args.get('text', '').strip()
+    if not text:
+        return jsonify({"success": False, "error": "Seslendirilecek metin boş olamaz"})
+
+    return _audio_response(text, request.args.get('format'))
+
+
+@app.route('/api/pronounce/batch', methods=['POST'])
+def api_pronounce_batch():
+    """
+    Bir sayfadaki tüm kelimeleri tek seferde seslendirir (toplu model geçişi) ve
+    önbelleklenebilir GET URL'lerinden oluşan bir manifest döndürür.
+    """
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Giriş yapmanız gerekli"})
+
+    data = request.get_json(force=True)
+    texts = [t.strip() for t in data.get('texts', []) if isinstance(t, str) and t.strip()]
+    texts = list(dict.fromkeys(texts))[:PRONOUNCE_BATCH_LIMIT]
+    fmt = _negotiate_audio_format(data.get('format'))
+    if fmt is None:
+        return jsonify({"success": False, "error": "Desteklenmeyen ses formatı"})
+
     try:
-        audio_bytes = sound.synthesize_wav_bytes(text)
-        # WAV bytes'ı direkt response olarak döndür
-        from flask import Response
-        return Response(audio_bytes, mimetype='audio/wav')
+        sound.synthesize_many(texts, fmt)
+    except sound.TTSBusyError as e:
+        return _tts_busy_response(e)
+    except Exception as e:
+        print(f"TTS batch error: {e}")
+        return jsonify({"success": False, "error": "Ses oluşturulamadı"})
+
+    return jsonify({
+        "success": True,
+        "format": fmt,
+        "items": [
+            {"text": text, "url": url_for('api_pronounce_get', text=text, format=fmt)}
+            for text in texts
+        ]
+    })
+
+
+def _tts_busy_response(error):
+    # TTS kuyruğu dolu: beklemek yerine hızlıca 503 dön, istemci Retry-After sonra tekrar denesin
+    response = jsonify({"success": False, "error": "Ses servisi şu an yoğun, lütfen tekrar deneyin"})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def _negotiate_audio_format(requested):
+    # Açıkça istenen format öncelikli; yoksa Accept başlığına göre seç (varsayılan WAV)
+    if requested:
+        return requested if requested in sound.AUDIO_FORMATS else None
+    mimetypes = {mimetype: fmt for fmt, (_, _, mimetype) in sound.AUDIO_FORMATS.items()}
+    best = request.accept_mimetypes.best_match(list(mimetypes), default="audio/wav")
+    return mimetypes[best]
+
+
+def _audio_response(text, requested_format):
+    fmt = _negotiate_audio_format(requested_format)
+    if fmt is None:
+        return jsonify({"success": False, "error": "Desteklenmeyen ses formatı"})
+
+    try:
+        audio_bytes = sound.synthesize_audio_bytes(text, fmt)
+    except sound.TTSBusyError as e:
+        return _tts_busy_response(e)
     except Exception as e:
         print(f"TTS error: {e}")
         return jsonify({"success": False, "error": "Ses oluşturulamadı"})
 
+    response = Response(audio_bytes, mimetype=sound.AUDIO_FORMATS[fmt][2])
+    # Strong ETag: içeriğin hash'i; If-None-Match eşleşirse 304 döner
+    response.set_etag(hashlib.sha256(audio_bytes).hexdigest())
+    # Oturum gerektiren yanıt: yalnızca tarayıcı saklar, paylaşılan önbellek/CDN oturumsuz istemcilere sunmaz
+    response.headers['Cache-Control'] = f"private, max-age={AUDIO_MAX_AGE}"
+    response.vary.add('Accept')
+    return response.make_conditional(request)
+
 
 def generate_hobby_words(hobby):
     """Hobi bazlı basit kelime listeleri oluşturur"""
@@ -425,10 +608,4 @@ def generate_hobby_words(hobby):
 if __name__ == '__main__':
     print(" WordMaster AI başlatılıyor...")
     print(" http://localhost:8080 adresine gidin")
-    # TTS model warmup (opsiyonel): ilk isteği hızlandırır
-    try:
-        sound.synthesize_wav_bytes("hello")
-        print(" TTS hazır")
-    except Exception as _e:
-        print(" TTS warmup atlandı")
     app.run(debug=True, host='0.0.0.0', port=8080)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Analyzer mikro-benchmark'ı: analyze_word_in_sentence'ın çağrı başına gecikmesini
+eski yolla (her çağrıda nltk.word_tokenize + nltk.pos_tag + yeni WordNetLemmatizer) karşılaştırır.
+Kullanım: python bench_analyzer.py [--rounds 20]
+"""
+
+import argparse
+import statistics
+import time
+
+from nltk import pos_tag, word_tokenize
+from nltk.stem import WordNetLemmatizer
+
+import analyzer
+
+PAIRS = [
+    ("runs", "She runs every morning before work."),
+    ("balls", "The kids threw the balls over the fence."),
+    ("taken", "The taken seats were reserved for guests."),
+    ("book", "I will book a table for dinner tonight."),
+    ("quickly", "He quickly finished his homework."),
+    ("beautiful", "They live in a beautiful house near the sea."),
+    ("investment", "The investment paid off after two years."),
+    ("cooking", "My father is cooking pasta for everyone."),
+    ("studied", "We studied the algorithm for hours."),
+    ("light", "The photographer waited for the perfect light."),
+    ("play", "Children play football in the park."),
+    ("healthier", "Fresh vegetables make meals healthier."),
+]
+
+
+def analyze_legacy(word, sentence):
+    # Değişiklik öncesi yol: tagger ve lemmatizer her çağrıda yeniden oluşturulur
+    tokens = word_tokenize(sentence)
+    tagged = analyzer.refine_tags(tokens, pos_tag(tokens))
+    idx = next((i for i, tok in enumerate(tokens) if tok.lower() == word.lower()), 0)
+    tok, tag = tagged[idx]
+    wn_pos = analyzer.to_wordnet_pos(tag)
+    wnl = WordNetLemmatizer()
+    return wnl.lemmatize(tok, pos=wn_pos) if wn_pos else wnl.lemmatize(tok)
+
+
+def measure(fn, rounds):
+    fn(*PAIRS[0])  # ısınma: korpus/model yüklemesi ölçüme girmesin
+    latencies = []
+    for _ in range(rounds):
+        for word, sentence in PAIRS:
+            start = time.perf_counter()
+            fn(word, sentence)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "mean_us": statistics.fmean(latencies) * 1e6,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6,
+        "calls": len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="analyze_word_in_sentence micro-benchmark")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {
+        "before": measure(analyze_legacy, args.rounds),
+        "after": measure(analyzer.analyze_word_in_sentence, args.rounds),
+    }
+    print(f"{'':<8} {'calls':>6} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10}")
+    for name, r in results.items():
+        print(f"{name:<8} {r['calls']:>6} {r['mean_us']:>10.1f} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f}")
+    print(f"⚡ Hızlanma (mean): {results['before']['mean_us'] / results['after']['mean_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
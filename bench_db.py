@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Veritabanı benchmark'ı: /, /words ve /api/word/attempt yollarının çağırdığı veritabanı metotlarında saniyedeki
+çağrı sayısını eski yol (her çağrıda pragmasız sqlite3.connect, varsayılan rollback journal) ile thread başına
+kalıcı WAL bağlantısı arasında karşılaştırır. Flask katmanı iki ölçümde de aynı olduğundan ölçülmez.
+Ölçümler geçici bir veritabanında yapılır.
+Kullanım: python bench_db.py [--requests 300] [--threads 4] [--words 2000]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from database import Database
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+
+class _BaselineDatabase(Database):
+    """Eski bağlantı yolu: her metot çağrısında yeni, pragmasız bağlantı (journal_mode varsayılan DELETE)."""
+
+    def __init__(self, db_path):
+        super().__init__(db_path, persistent=False)
+
+    def _open(self):
+        return sqlite3.connect(self.db_path)
+
+
+def _seed(db, words):
+    db.create_user(EMAIL, PASSWORD, "Bench")
+    user_id = db.get_user_id_by_email(EMAIL)
+    db.add_word_entries_bulk(user_id, [f"benchword{i}" for i in range(words)])
+    return user_id
+
+
+# Her yolun route'unda çağrılan veritabanı metodu
+PATHS = {
+    "/": lambda db, user_id, i: db.get_user_stats(user_id),
+    "/words": lambda db, user_id, i: db.list_user_words_page(user_id, per_page=50),
+    "/api/word/attempt": lambda db, user_id, i: db.save_word_attempt(
+        user_id, f"attempt{i % 50}", "bench", "bench", "beginner", i % 2
+    ),
+}
+
+
+def measure(make_db, requests, threads, words):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(os.path.join(tmp, "bench.db"))
+        user_id = _seed(db, words)
+        with sqlite3.connect(db.db_path) as conn:
+            journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        for path, call in PATHS.items():
+            errors = []
+
+            def worker(count):
+                for i in range(count):
+                    try:
+                        result = call(db, user_id, i)
+                    except sqlite3.Error as e:
+                        errors.append(e)
+                        continue
+                    if isinstance(result, dict) and result.get("success") is False:
+                        errors.append(result.get("error"))
+
+            per_thread = max(1, requests // threads)
+            pool = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(threads)]
+            start = time.perf_counter()
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+            elapsed = time.perf_counter() - start
+            results[path] = {"rps": per_thread * threads / elapsed, "errors": len(errors)}
+    return journal, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database connection benchmark")
+    parser.add_argument("--requests", type=int, default=300, help="Yol başına toplam istek")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--words", type=int, default=2000, help="Kullanıcının kelime sayısı")
+    args = parser.parse_args()
+
+    before_journal, before = measure(_BaselineDatabase, args.requests, args.threads, args.words)
+    after_journal, after = measure(lambda path: Database(path, persistent=True),
+                                   args.requests, args.threads, args.words)
+
+    print(f"journal_mode: before={before_journal} after={after_journal}")
+    print(f"{'path':<20} {'before rps':>11} {'after rps':>11} {'errors':>8} {'speedup':>8}")
+    for path in PATHS:
+        b, a = before[path], after[path]
+        print(f"{path:<20} {b['rps']:>11.1f} {a['rps']:>11.1f} "
+              f"{b['errors']:>3}/{a['errors']:<4} {a['rps'] / b['rps']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
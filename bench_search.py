@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Kelime araması benchmark'ı: list_user_words(search=...) gecikmesini yalnızca LIKE (kullanıcının tüm
+satırlarını okur) ile kullanıcıya göre sınırlanan trigram indeksi arasında karşılaştırır.
+Geçici veritabanına users x words satır (varsayılan 1M) ve çok kelimeli bir kullanıcı eklenir.
+Kullanım: python bench_search.py [--users 1000] [--words 1000] [--heavy-words 100000] [--rounds 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from database import Database
+
+SYLLABLES = ["ing", "tion", "pro", "con", "ex", "re", "ment", "ly", "ness", "ab", "ca", "de", "in", "ter", "ous",
+             "al", "er", "ic", "ful", "pre", "sub", "un", "dis", "ver", "com", "sta", "tri", "ble", "ize", "man"]
+# Sık geçenden hiç geçmeyene arama terimleri
+TERMS = ["ing", "tionment", "abcaful", "proconex", "mantriize", "xyz"]
+
+
+def _vocabulary(rng, count):
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return list(words)
+
+
+def _seed(db, users, words, heavy_words, seed=1):
+    rng = random.Random(seed)
+    for i in range(users + 1):
+        user_id = db.create_user(f"search{i}@example.com", "bench-password")["user_id"]
+        db.add_word_entries_bulk(user_id, _vocabulary(rng, heavy_words if i == users else words))
+    return user_id
+
+
+def _median_ms(db, user_id, term, rounds):
+    db.list_user_words(user_id, limit=51, search=term)
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        db.list_user_words(user_id, limit=51, search=term)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word search benchmark")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=1000, help="Kullanıcı başına kelime")
+    parser.add_argument("--heavy-words", type=int, default=100000, help="Çok kelimeli kullanıcının kelime sayısı")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        if not db.word_search:
+            print("❌ FTS5 trigram bu SQLite derlemesinde yok")
+            return
+        start = time.perf_counter()
+        heavy_user = _seed(db, args.users, args.words, args.heavy_words)
+        rows = args.users * args.words + args.heavy_words
+        print(f"✅ {rows} kelime eklendi ({time.perf_counter() - start:.1f}s)")
+
+        users = {"typical": args.users // 2, "heavy": heavy_user}
+        print(f"{'user':<8} {'term':<10} {'like ms':>9} {'index ms':>9} {'speedup':>8}")
+        for label, user_id in users.items():
+            for term in TERMS:
+                db.word_search = False
+                like = _median_ms(db, user_id, term, args.rounds)
+                db.word_search = True
+                indexed = _median_ms(db, user_id, term, args.rounds)
+                print(f"{label:<8} {term:<10} {like:>9.2f} {indexed:>9.2f} {like / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Çeviri benchmark'ı: quality ve fast modlarını sabit bir örnek cümle kümesinde karşılaştırır.
+Kullanım: python bench_translate.py [--rounds 3] [--modes quality fast]
+Önbellek devre dışıdır; her ölçüm doğrudan modeli çalıştırır.
+"""
+
+import argparse
+import statistics
+import time
+
+import torch
+
+import translate
+
+CORPUS = [
+    "I usually drink coffee before I start working.",
+    "She is reading a book about artificial intelligence.",
+    "We visited the museum last weekend.",
+    "He has finished his homework already.",
+    "The software update fixed several security problems.",
+    "My grandmother cooks delicious soup every winter.",
+    "They are training for the city marathon.",
+    "The company announced a new investment strategy.",
+    "Regular exercise improves both mental and physical health.",
+    "The photographer waited hours for the perfect light.",
+    "Our teacher explained the difficult topic very clearly.",
+    "I have never travelled to Japan before.",
+    "The musicians practised the song until midnight.",
+    "A healthy diet includes fresh fruit and vegetables.",
+    "The algorithm sorts the data in a few seconds.",
+    "Children learn new words quickly when they play games.",
+    "The doctor recommended a short course of therapy.",
+    "We are planning a trip to the mountains.",
+    "The market was crowded with tourists on Sunday.",
+    "She played the piano beautifully at the concert.",
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def bench_mode(mode, rounds):
+    load_start = time.perf_counter()
+    translate._ensure_model_loaded(mode)
+    load_time = time.perf_counter() - load_start
+
+    # Isınma turu: ilk çağrıların ek maliyeti ölçüme girmesin
+    translate._translate_uncached(CORPUS[:2], mode)
+
+    latencies = []
+    total_start = time.perf_counter()
+    for _ in range(rounds):
+        for sentence in CORPUS:
+            start = time.perf_counter()
+            translate._translate_uncached([sentence], mode)
+            latencies.append(time.perf_counter() - start)
+    total = time.perf_counter() - total_start
+
+    batch_start = time.perf_counter()
+    for _ in range(rounds):
+        translate._translate_uncached(CORPUS, mode)
+    batch_total = time.perf_counter() - batch_start
+
+    return {
+        "mode": mode,
+        "load_s": load_time,
+        "sent_per_s": len(latencies) / total,
+        "batch_sent_per_s": len(CORPUS) * rounds / batch_total,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation quality/fast mode benchmark")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=list(translate.TRANSLATE_MODES))
+    args = parser.parse_args()
+
+    print(f"📊 {len(CORPUS)} cümle x {args.rounds} tur, torch threads: {torch.get_num_threads()}")
+    print(f"{'mode':<8} {'load s':>8} {'sent/s':>8} {'batch sent/s':>13} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes:
+        r = bench_mode(mode, args.rounds)
+        print(f"{r['mode']:<8} {r['load_s']:>8.2f} {r['sent_per_s']:>8.2f} {r['batch_sent_per_s']:>13.2f} "
+              f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+#Bu modül süreç içi LRU + SQLite destekli kalıcı önbellek sağlar
+
+
+def make_key(*parts) -> str:
+    """Parçalardan içerik adresli (sha256) bir anahtar üretir."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TieredCache:
+    """
+    İki katmanlı önbellek:
+    - Süreç içi LRU (OrderedDict) -> sık kullanılanlar için SQLite'a hiç gidilmez
+    - SQLite tablosu -> yeniden başlatmalardan sonra da kalır, tüm worker'lar paylaşır
+    Değerler JSON'a çevrilebilir olmalıdır. ttl_seconds verilirse daha eski kayıtlar miss sayılır.
+    Bellekte de JSON metni tutulur: her get yeni bir nesne döndürür, çağıranın değişiklikleri önbelleğe yansımaz.
+    """
+
+    def __init__(self, db_path, table, max_entries=100000, memory_entries=1024,
+                 evict_every=100, ttl_seconds=None):
+        self.db_path = db_path
+        self.table = table
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.evict_every = evict_every
+        self.ttl_seconds = ttl_seconds
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        conn = self._conn()
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_used ON {self.table}(last_used)")
+        conn.commit()
+
+    def _conn(self):
+        # Her thread kendi bağlantısını kullanır; WAL ile süreçler arası eşzamanlı okuma/yazma.
+        # Fork öncesi açılmış bağlantı çocuk süreçte kullanılmaz (SQLite bağlantıları fork'a güvenli değil)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _expired(self, created_at, now):
+        return self.ttl_seconds is not None and created_at < now - self.ttl_seconds
+
+    def _remember(self, key, value, created_at):
+        with self._lock:
+            self._memory[key] = (created_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Bulunan anahtarlar için {key: value} döndürür; bulunamayanlar sözlükte yer almaz."""
+        found = {}
+        missing = []
+        now = time.time()
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._memory.get(key)
+                if entry is not None and not self._expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    found[key] = json.loads(entry[1])
+                    self._stats["memory_hits"] += 1
+                else:
+                    self._memory.pop(key, None)
+                    missing.append(key)
+
+        if missing:
+            conn = self._conn()
+            placeholders = ",".join("?" * len(missing))
+            rows = conn.execute(
+                f"SELECT key, value, created_at FROM {self.table} WHERE key IN ({placeholders})",
+                missing
+            ).fetchall()
+            rows = [r for r in rows if not self._expired(r[2], now)]
+            if rows:
+                conn.execute(
+                    f"UPDATE {self.table} SET last_used = ? WHERE key IN ({','.join('?' * len(rows))})",
+                    [now] + [r[0] for r in rows]
+                )
+                conn.commit()
+            for key, value, created_at in rows:
+                found[key] = json.loads(value)
+                self._remember(key, value, created_at)
+
+            with self._lock:
+                self._stats["disk_hits"] += len(rows)
+                self._stats["misses"] += len(missing) - len(rows)
+
+        return found
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items):
+        if not items:
+            return
+        now = time.time()
+        encoded = {key: json.dumps(value, ensure_ascii=False) for key, value in items.items()}
+        conn = self._conn()
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+            [(key, value, now, now) for key, value in encoded.items()]
+        )
+        conn.commit()
+        for key, value in encoded.items():
+            self._remember(key, value, now)
+
+        with self._lock:
+            self._writes += len(items)
+            due = self._writes >= self.evict_every
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Süresi dolan kayıtları, ardından boyut sınırı aşıldıysa en uzun süredir kullanılmayanları siler."""
+        conn = self._conn()
+        removed = 0
+        if self.ttl_seconds is not None:
+            removed += conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+        count = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(f"""
+                DELETE FROM {self.table}
+                WHERE key IN (SELECT key FROM {self.table} ORDER BY last_used ASC LIMIT ?)
+            """, (excess,))
+            removed += excess
+        conn.commit()
+        with self._lock:
+            self._stats["evictions"] += removed
+        return removed
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute(f"DELETE FROM {self.table}")
+        conn.commit()
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        """Süreç içi hit/miss sayaçları ve kalıcı katmandaki kayıt sayısı."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["disk_entries"] = self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+class FileStore:
+    """
+    İçerik adresli dosya deposu (ör. ses dosyaları): her anahtar root/ab/<key><suffix> dosyasıdır.
+    Dosya sistemi üzerinden tüm worker'lar paylaşır. Okunan dosyanın mtime'ı güncellenir;
+    toplam boyut max_bytes'ı aşınca en uzun süredir kullanılmayanlar silinir (LRU).
+    """
+
+    def __init__(self, root, max_bytes, suffix="", evict_every=50):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.root, key[:2], f"{key}{self.suffix}")
+
+    def get(self, key):
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU için son kullanım zamanı
+        except FileNotFoundError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+        return data
+
+    def contains(self, key):
+        return os.path.exists(self.path_for(key))
+
+    def put(self, key, data):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Önce geçici dosyaya yaz, sonra atomik olarak taşı: diğer worker'lar yarım dosya görmez
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes >= self.evict_every
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue  # başka bir worker silmiş olabilir
+                yield st.st_mtime, st.st_size, path
+
+    def evict(self):
+        """Toplam boyut sınırı aşıldıysa en eski kullanılanlardan başlayarak %90'a inene kadar siler."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return 0
+        target = self.max_bytes * 0.9
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._stats["evictions"] += removed
+        return removed
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_bytes"] = self.max_bytes
+        return stats
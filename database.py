@@ -1,19 +1,216 @@
 import sqlite3
+import base64
 import hashlib
 import json
+import random
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from datetime import datetime, timedelta
 import os
 
+# 0 => her metot kendi bağlantısını açıp kapatır (eski davranış; karşılaştırma/hata ayıklama için)
+DB_PERSISTENT_CONNECTIONS = os.getenv("DB_PERSISTENT_CONNECTIONS", "1") == "1"
+# Kilitli veritabanında hata vermeden önce beklenecek süre (ms)
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
+# Bağlantı başına hazırlanmış (prepared) ifade önbelleği
+DB_CACHED_STATEMENTS = int(os.getenv("DB_CACHED_STATEMENTS", 256))
+# Bu uzunluktan kısa aramalar trigram indeksini kullanamaz, LIKE ile yapılır
+FTS_MIN_QUERY = 3
+# Bu kadar ya da daha az kelimesi olan kullanıcıda LIKE ile (user_id, created_at) aralığını okumak indeksten ucuzdur
+FTS_MIN_USER_WORDS = int(os.getenv("FTS_MIN_USER_WORDS", 2000))
+# Eşleşme sayısı bunu aşan (sık geçen) terimlerde LIKE ilk sayfayı erkenden doldurur, indeks kullanılmaz
+FTS_MAX_MATCHES = int(os.getenv("FTS_MAX_MATCHES", 1000))
+# Arama indeksinde rowid = user_id * FTS_USER_STRIDE + entry id: bir kullanıcının satırları bitişik bir rowid
+# aralığındadır, MATCH yalnızca o aralıkta aranır (entry id'lerinin 2^32'den küçük olduğu varsayılır)
+FTS_USER_STRIDE = 1 << 32
+# Hobi kelime önbelleğinin süreç içindeki ömrü (saniye); diğer worker'ların kayıtları en geç bu sürede görünür
+HOBBY_CACHE_TTL = int(os.getenv("HOBBY_CACHE_TTL", 300))
+
+# Sık çalışan sorgular: metotlar ve check_query_plans aynı SQL'i kullanır, plan kontrolü gerçek sorguyu doğrular
+SQL_DUE_REMINDERS = """
+    SELECT
+      rr.id           AS rule_id,
+      rr.user_id,
+      rr.interval_days,
+      u.email         AS email,
+      we.word         AS word
+    FROM reminder_rules rr
+    JOIN users       u  ON u.id = rr.user_id
+    JOIN word_entries we ON we.id = rr.entry_id
+    WHERE rr.is_active = 1
+      AND rr.next_run_at <= CURRENT_TIMESTAMP
+    ORDER BY rr.next_run_at ASC
+    LIMIT ?
+"""
+
+SQL_WORD_ATTEMPT = """
+    SELECT id, attempts FROM user_words
+    WHERE user_id = ? AND word = ?
+"""
+
+SQL_HOBBY_VOCABULARY = """
+    SELECT word, definition, level FROM hobby_words
+    WHERE hobby = ?
+"""
+
+SQL_SUGGEST_WORDS = """
+    SELECT word FROM word_entries
+    WHERE user_id = ? AND word >= ? COLLATE NOCASE AND word < ? COLLATE NOCASE
+    ORDER BY word COLLATE NOCASE
+    LIMIT ?
+"""
+
+# Kullanıcının FTS_MIN_USER_WORDS'ten fazla kelimesi varsa bir satır döner (indeksteki ilk N kayıt atlanır)
+SQL_USER_HAS_MANY_WORDS = """
+    SELECT 1 FROM word_entries
+    WHERE user_id = ?
+    ORDER BY created_at
+    LIMIT 1 OFFSET ?
+"""
+
+# Kullanıcının rowid aralığındaki eşleşmeler; LIMIT FTS_MAX_MATCHES + 1 ile sınırlanır
+SQL_WORD_SEARCH_MATCHES = """
+    SELECT rowid FROM word_entries_search
+    WHERE word_entries_search MATCH ? AND rowid BETWEEN ? AND ?
+    LIMIT ?
+"""
+
+
+def _fts_phrase(search):
+    # Arama metni tek bir FTS ifadesi (phrase) olarak aranır; operatör olarak yorumlanmaz
+    return '"' + search.replace('"', '""') + '"'
+
+
+def _like_escape(search):
+    # % ve _ harfiyen aranır; FTS yolu da metni olduğu gibi aradığından iki yol aynı sonucu verir
+    return search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_rowid_range(user_id):
+    return user_id * FTS_USER_STRIDE, (user_id + 1) * FTS_USER_STRIDE - 1
+
+
+def _is_full_scan(step):
+    if not step.startswith("SCAN"):
+        return False
+    if " VIRTUAL TABLE INDEX " in step:
+        idx = step.rsplit(":", 1)[-1]
+        return not ("M" in idx and "<" in idx and ">" in idx)
+    return True
+
+
+def encode_cursor(row):
+    """Sayfalama cursor'ı: (created_at, id) anahtarının opak, URL-güvenli hali"""
+    raw = json.dumps([row["created_at"], row["id"]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Geçersiz ya da boş cursor için None (ilk sayfa) döner"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, entry_id = json.loads(raw)
+        return str(created_at), int(entry_id)
+    except (ValueError, TypeError):
+        return None
+
+
 class Database:
-    def __init__(self, db_path='wordmaster.db'):
+    def __init__(self, db_path='wordmaster.db', persistent=None):
         self.db_path = db_path
+        self.persistent = DB_PERSISTENT_CONNECTIONS if persistent is None else persistent
+        self._local = threading.local()
+        self._hobby_cache = {}  # hobby -> (yüklenme zamanı, {seviye|None: [kelime, ...]})
+        self._hobby_lock = threading.Lock()
         self.init_database()
+        self.word_search = self._table_exists("word_entries_search")
+
+    def _open(self):
+        # Pragmalar bağlantı başına bir kez ayarlanır
+        conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000,
+                               cached_statements=DB_CACHED_STATEMENTS)
+        conn.execute("PRAGMA journal_mode = WAL")  # okuyucular yazıcıyı, yazıcı okuyucuları bloklamaz
+        conn.execute("PRAGMA synchronous = NORMAL")  # WAL'da güvenli, her commit'te fsync yok
+        conn.execute("PRAGMA foreign_keys = ON")  # FK'ler için şart (her connection'da)
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """
+        Thread başına kalıcı bağlantı (fork sonrası yeniden açılır). row_factory bağlantıda değil
+        cursor'da ayarlanır; bağlantı metotlar arasında paylaşılır.
+        Commit edilmeden kalan iş çıkışta geri alınır (bağlantıyı kapatmakla aynı sonuç).
+        """
+        if self.persistent:
+            conn = getattr(self._local, "conn", None)
+            if conn is None or self._local.pid != os.getpid():
+                conn = self._open()
+                self._local.conn, self._local.pid = conn, os.getpid()
+        else:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if not self.persistent:
+                conn.close()
 
     def init_database(self):
-        """Veritabanını ve tabloları (SQLite uyumlu) oluşturur"""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON")  # FK'ler için şart (her connection'da)
+        """Veritabanını ve tabloları (SQLite uyumlu) oluşturur, bekleyen şema göçlerini uygular"""
+        applied = self.migrate()
+        if applied:
+            print(f"Veritabanı şeması güncellendi: v{applied[-1]}")
+        print("Veritabanı başarıyla oluşturuldu")
+
+    def _table_exists(self, name):
+        with self._connection() as conn:
+            return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    def schema_version(self):
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+    def migrate(self):
+        """
+        MIGRATIONS listesindeki henüz uygulanmamış göçleri sırayla, her birini kendi transaction'ında uygular.
+        BEGIN IMMEDIATE yazma kilidini alır: aynı anda açılan worker'lardan yalnızca biri göç çalıştırır,
+        diğerleri bekler ve sürümü yeniden okuyup atlar. Atlanan (False döndüren) göçler kaydedilmez,
+        sonraki çağrıda yeniden denenir. Uygulanan sürümleri döndürür.
+        """
+        applied = []
+        self.schema_version()  # schema_version tablosunu oluşturur
+        with self._connection() as conn:
+            recorded = {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+        for version, name, migration in self.MIGRATIONS:
+            if version in recorded:
+                continue
+            with self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                done = conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone()
+                if not done:
+                    if migration(self, conn) is False:
+                        conn.rollback()
+                        continue
+                    conn.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (version, name))
+                    applied.append(version)
+                conn.commit()
+        return applied
+
+    def _create_tables(self, conn):
+        # v1: ilk şema. Göç sistemi öncesinde oluşturulmuş veritabanlarında da güvenle çalışır (IF NOT EXISTS)
         cursor = conn.cursor()
 
 
@@ -115,9 +312,130 @@ class Database:
             ON word_entries(user_id, word COLLATE NOCASE)
         ''')
 
-        conn.commit()
-        conn.close()
-        print("Veritabanı başarıyla oluşturuldu")
+    def _add_hot_path_indexes(self, conn):
+        # v2: sık çalışan sorgular için indeksler (check_query_plans ile tam tarama olmadığı doğrulanır)
+        # get_due_reminders: filtre + sıralama indeksten, seçilen sütunlar da indekste (covering)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reminder_rules_due
+            ON reminder_rules(is_active, next_run_at, user_id, entry_id, interval_days)
+        """)
+        # save_word_attempt: (user_id, word) araması; attempts indeksten okunur (id = rowid)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_words_user_word
+            ON user_words(user_id, word, attempts)
+        """)
+        # get_hobby_words: (hobby, level) filtresi; dönen sütunlar indekste
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_hobby_words_hobby_level
+            ON hobby_words(hobby, level, word, definition)
+        """)
+        # list_user_words: kullanıcı başına created_at sıralaması; eşit zamanlarda rowid (id) sırası korunur
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_word_entries_user_created
+            ON word_entries(user_id, created_at)
+        """)
+
+    def _dedupe_hobby_words(self, conn):
+        # v3: unique key olmadığı için INSERT OR REPLACE her kayıtta yeni satır ekliyordu.
+        # Her (hobby, word) için en son eklenen satır tutulur, ardından tekrar oluşmasın diye unique index
+        conn.execute("""
+            DELETE FROM hobby_words
+            WHERE id NOT IN (SELECT MAX(id) FROM hobby_words GROUP BY hobby, word)
+        """)
+        conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_hobby_words_hobby_word
+            ON hobby_words(hobby, word)
+        """)
+
+    def _add_word_search(self, conn):
+        # v4: kullanıcıya göre sınırlanan FTS5 trigram indeksi. rowid = user_id * FTS_USER_STRIDE + id olduğundan
+        # MATCH yalnızca tek kullanıcının rowid aralığında aranır. Contentless: metin word_entries'te kalır.
+        # FTS5/trigram yoksa False döner; sürüm kaydedilmez, göç sonraki açılışta yeniden denenir.
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS word_entries_search USING fts5(
+                    word, content='', tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 trigram kullanılamıyor, arama LIKE ile yapılacak: {e}")
+            return False
+
+        key = f"* {FTS_USER_STRIDE} +"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS word_entries_search_ai AFTER INSERT ON word_entries BEGIN
+                INSERT INTO word_entries_search(rowid, word) VALUES (new.user_id {key} new.id, new.word);
+            END
+        """)
+        # Contentless tabloda silmek için eski değerler de verilir
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS word_entries_search_ad AFTER DELETE ON word_entries BEGIN
+                INSERT INTO word_entries_search(word_entries_search, rowid, word)
+                VALUES ('delete', old.user_id {key} old.id, old.word);
+            END
+        """)
+        # Yalnızca word/user_id değişince: next_reminder_at güncellemeleri indekse dokunmaz
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS word_entries_search_au AFTER UPDATE OF word, user_id ON word_entries BEGIN
+                INSERT INTO word_entries_search(word_entries_search, rowid, word)
+                VALUES ('delete', old.user_id {key} old.id, old.word);
+                INSERT INTO word_entries_search(rowid, word) VALUES (new.user_id {key} new.id, new.word);
+            END
+        """)
+        # Mevcut kelimeleri indeksle (contentless tabloda 'rebuild' yoktur)
+        conn.execute(f"INSERT INTO word_entries_search(rowid, word) SELECT user_id {key} id, word FROM word_entries")
+
+    # Şema göçleri: (sürüm, ad, fonksiyon). Yalnızca sona eklenir; uygulanmış göçler değiştirilmez.
+    # False döndüren göç atlanmış sayılır: değişiklikleri geri alınır, sürümü kaydedilmez.
+    MIGRATIONS = [
+        (1, "baseline", _create_tables),
+        (2, "hot path indexes", _add_hot_path_indexes),
+        (3, "unique hobby words", _dedupe_hobby_words),
+        (4, "word search index", _add_word_search),
+    ]
+
+    def hot_queries(self):
+        """
+        Sık çalışan sorgular ve örnek parametreleri: {ad: (sql, params)}.
+        SQL metotlarla aynı sabitlerden/oluşturuculardan gelir; check_query_plans bunları doğrular.
+        """
+        key = ("2024-01-01 00:00:00", 1000)
+        queries = {
+            "get_due_reminders": (SQL_DUE_REMINDERS, (100,)),
+            "save_word_attempt": (SQL_WORD_ATTEMPT, (1, "word")),
+            "get_hobby_words": (SQL_HOBBY_VOCABULARY, ("technology",)),
+            "suggest_user_words": (SQL_SUGGEST_WORDS, (1, "wor", "wos", 10)),
+            "user_has_many_words": (SQL_USER_HAS_MANY_WORDS, (1, FTS_MIN_USER_WORDS)),
+        }
+        variants = {
+            "list_user_words": {},
+            "list_user_words_after": {"after": key},
+            "list_user_words_before": {"before": key},
+            "list_user_words_search_short": {"search": "wo"},
+            "list_user_words_search_like": {"search": "word", "after": key},
+        }
+        if self.word_search:
+            lo, hi = _fts_rowid_range(1)
+            queries["word_search_matches"] = (SQL_WORD_SEARCH_MATCHES, ('"word"', lo, hi, FTS_MAX_MATCHES + 1))
+            variants["list_user_words_search"] = {"search": "word", "after": key, "fts": True}
+        for name, kwargs in variants.items():
+            sql, params, _ = self._user_words_query(1, 51, 0, **kwargs)
+            queries[name] = (sql, params)
+        return queries
+
+    def check_query_plans(self):
+        """
+        hot_queries() için EXPLAIN QUERY PLAN çalıştırır.
+        {sorgu: {"plan": [...], "full_scan": bool}} döndürür; SCAN adımı tam tablo/indeks taramasıdır.
+        FTS araması da SCAN ... VIRTUAL TABLE INDEX olarak görünür: yalnızca MATCH ("M") ile birlikte rowid
+        aralığı ("<", ">") da kullanıyorsa, yani tek kullanıcının satırlarına sınırlıysa tarama sayılmaz.
+        """
+        results = {}
+        with self._connection() as conn:
+            for name, (sql, params) in self.hot_queries().items():
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+                results[name] = {"plan": plan, "full_scan": any(map(_is_full_scan, plan))}
+        return results
 
     def hash_password(self, password):
         """Şifreyi hashler"""
@@ -125,79 +443,73 @@ class Database:
     
     def create_user(self, email, password, name=None):
         """Yeni kullanıcı oluşturur"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            password_hash = self.hash_password(password)
-            cursor.execute('''
-                INSERT INTO users (email, password_hash, name)
-                VALUES (?, ?, ?)
-            ''', (email, password_hash, name))
-            
-            user_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            return {"success": True, "user_id": user_id}
+        with self._connection() as conn:
+            cursor = conn.cursor()
             
-        except sqlite3.IntegrityError:
-            conn.close()
-            return {"success": False, "error": "Bu email adresi zaten kayıtlı"}
-        except Exception as e:
-            conn.close()
-            return {"success": False, "error": str(e)}
+            try:
+                password_hash = self.hash_password(password)
+                cursor.execute('''
+                    INSERT INTO users (email, password_hash, name)
+                    VALUES (?, ?, ?)
+                ''', (email, password_hash, name))
+                
+                user_id = cursor.lastrowid
+                conn.commit()
+                return {"success": True, "user_id": user_id}
+                
+            except sqlite3.IntegrityError:
+                return {"success": False, "error": "Bu email adresi zaten kayıtlı"}
+            except Exception as e:
+                return {"success": False, "error": str(e)}
     
     def authenticate_user(self, email, password):
         """Kullanıcı girişi doğrular"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        password_hash = self.hash_password(password)
-        cursor.execute('''
-            SELECT id, email, name, interests, level_preference,
-                   total_words_learned, total_correct_answers, current_streak
-            FROM users 
-            WHERE email = ? AND password_hash = ?
-        ''', (email, password_hash))
-        
-        user = cursor.fetchone()
-        
-        if user:
-            # Son giriş tarihini güncelle
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            password_hash = self.hash_password(password)
             cursor.execute('''
-                UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?
-            ''', (user[0],))
-            conn.commit()
+                SELECT id, email, name, interests, level_preference,
+                       total_words_learned, total_correct_answers, current_streak
+                FROM users 
+                WHERE email = ? AND password_hash = ?
+            ''', (email, password_hash))
             
-            user_data = {
-                "id": user[0],
-                "email": user[1],
-                "name": user[2],
-                "interests": json.loads(user[3]) if user[3] else [],
-                "level_preference": user[4],
-                "total_words_learned": user[5],
-                "total_correct_answers": user[6],
-                "current_streak": user[7]
-            }
-            conn.close()
-            return {"success": True, "user": user_data}
-        
-        conn.close()
-        return {"success": False, "error": "Email veya şifre hatalı"}
+            user = cursor.fetchone()
+            
+            if user:
+                # Son giriş tarihini güncelle
+                cursor.execute('''
+                    UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?
+                ''', (user[0],))
+                conn.commit()
+                
+                user_data = {
+                    "id": user[0],
+                    "email": user[1],
+                    "name": user[2],
+                    "interests": json.loads(user[3]) if user[3] else [],
+                    "level_preference": user[4],
+                    "total_words_learned": user[5],
+                    "total_correct_answers": user[6],
+                    "current_streak": user[7]
+                }
+                return {"success": True, "user": user_data}
+            
+            return {"success": False, "error": "Email veya şifre hatalı"}
     
     def update_user_interests(self, user_id, interests):
         """Kullanıcının ilgi alanlarını günceller"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        interests_json = json.dumps(interests)
-        cursor.execute('''
-            UPDATE users SET interests = ? WHERE id = ?
-        ''', (interests_json, user_id))
-        
-        conn.commit()
-        conn.close()
-        return {"success": True}
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            interests_json = json.dumps(interests)
+            cursor.execute('''
+                UPDATE users SET interests = ? WHERE id = ?
+            ''', (interests_json, user_id))
+            
+            conn.commit()
+            return {"success": True}
 
     def add_word_entry(self, user_id: int, word: str):
         """
@@ -206,39 +518,36 @@ class Database:
         3) Başarılı eklemeden sonra reminder_rules'ta kural açar:
            - 10 saniye sonra 1 kez mail (interval_days = 0)
         """
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        try:
-            conn.execute("PRAGMA foreign_keys = ON")
-            cur = conn.cursor()
+        with self._connection() as conn:
+            try:
+                cur = conn.cursor()
 
-            # 1) Duplicate kontrolü (Apple == apple)
-            cur.execute("""
-                SELECT id FROM word_entries
-                WHERE user_id = ? AND word = ? COLLATE NOCASE
-                LIMIT 1
-            """, (user_id, word.strip()))
-            row = cur.fetchone()
-            if row:
-                return {"success": False, "error": "Bu kelime daha önce eklenmiş.", "entry_id": row[0]}
-
-            # 2) Kelimeyi ekle
-            cur.execute("""
-                INSERT INTO word_entries (user_id, word, created_at, next_reminder_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP, datetime(CURRENT_TIMESTAMP, '+' || ? || ' days'))
-            """, (user_id, word.strip(), 1))
-            entry_id = cur.lastrowid
+                # 1) Duplicate kontrolü (Apple == apple)
+                cur.execute("""
+                    SELECT id FROM word_entries
+                    WHERE user_id = ? AND word = ? COLLATE NOCASE
+                    LIMIT 1
+                """, (user_id, word.strip()))
+                row = cur.fetchone()
+                if row:
+                    return {"success": False, "error": "Bu kelime daha önce eklenmiş.", "entry_id": row[0]}
+
+                # 2) Kelimeyi ekle
+                cur.execute("""
+                    INSERT INTO word_entries (user_id, word, created_at, next_reminder_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP, datetime(CURRENT_TIMESTAMP, '+' || ? || ' days'))
+                """, (user_id, word.strip(), 1))
+                entry_id = cur.lastrowid
 
-            # İstatistik güncelle (opsiyonel)
-            cur.execute("""
-                UPDATE users SET total_words_learned = total_words_learned + 1
-                WHERE id = ?
-            """, (user_id,))
+                # İstatistik güncelle (opsiyonel)
+                cur.execute("""
+                    UPDATE users SET total_words_learned = total_words_learned + 1
+                    WHERE id = ?
+                """, (user_id,))
 
-            conn.commit()  # kelimeyi kesinleştir
-        except Exception as e:
-            conn.close()
-            return {"success": False, "error": str(e)}
+                conn.commit()  # kelimeyi kesinleştir
+            except Exception as e:
+                return {"success": False, "error": str(e)}
 
         # 3) Reminder kuralını AYNı DB için ayrı bir transaction’da oluştur
         rule_res = self.create_reminder_rule_for_entry(
@@ -252,28 +561,67 @@ class Database:
 
         return {"success": True, "entry_id": entry_id}
 
+    def add_word_entries_bulk(self, user_id: int, words):
+        """
+        Toplu içe aktarma için: kelimeleri ve hatırlatma kurallarını tek transaction'da ekler.
+        Mevcut kelimeler NOCASE unique index sayesinde atlanır (INSERT OR IGNORE).
+        """
+        with self._connection() as conn:
+            try:
+                cur = conn.cursor()
+
+                entry_ids = []
+                for word in words:
+                    cur.execute("""
+                        INSERT OR IGNORE INTO word_entries (user_id, word, created_at, next_reminder_at)
+                        VALUES (?, ?, CURRENT_TIMESTAMP, datetime(CURRENT_TIMESTAMP, '+' || ? || ' days'))
+                    """, (user_id, word.strip(), 1))
+                    if cur.rowcount:
+                        entry_ids.append(cur.lastrowid)
+
+                cur.executemany("""
+                  INSERT INTO reminder_rules
+                    (user_id, entry_id, interval_days, start_at, is_active, next_run_at)
+                  VALUES
+                    (?, ?, 1, CURRENT_TIMESTAMP, 1, datetime(CURRENT_TIMESTAMP, '+1 days'))
+                """, [(user_id, entry_id) for entry_id in entry_ids])
+
+                cur.execute("""
+                    UPDATE users SET total_words_learned = total_words_learned + ?
+                    WHERE id = ?
+                """, (len(entry_ids), user_id))
+
+                conn.commit()
+                return {"success": True, "inserted": len(entry_ids)}
+            except Exception as e:
+                conn.rollback()
+                return {"success": False, "error": str(e)}
+
+    def get_user_id_by_email(self, email):
+        with self._connection() as conn:
+            row = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()
+            return row[0] if row else None
+
     def _dt(dt: datetime) -> str:
         # SQLite için 'YYYY-MM-DD HH:MM:SS'
         return dt.strftime("%Y-%m-%d %H:%M:%S")
 
     def create_reminder_rule_for_entry(self, user_id: int, entry_id: int,
                                        interval_days: int = 1):  # varsayılan 1 gün
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-              INSERT INTO reminder_rules
-                (user_id, entry_id, interval_days, start_at, is_active, next_run_at)
-              VALUES
-                (?, ?, ?, CURRENT_TIMESTAMP, 1,
-                 datetime(CURRENT_TIMESTAMP, '+' || ? || ' days'))
-            """, (user_id, entry_id, interval_days, interval_days))
-            conn.commit()
-            return {"success": True, "rule_id": cur.lastrowid}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-        finally:
-            conn.close()
+        with self._connection() as conn:
+            try:
+                cur = conn.cursor()
+                cur.execute("""
+                  INSERT INTO reminder_rules
+                    (user_id, entry_id, interval_days, start_at, is_active, next_run_at)
+                  VALUES
+                    (?, ?, ?, CURRENT_TIMESTAMP, 1,
+                     datetime(CURRENT_TIMESTAMP, '+' || ? || ' days'))
+                """, (user_id, entry_id, interval_days, interval_days))
+                conn.commit()
+                return {"success": True, "rule_id": cur.lastrowid}
+            except Exception as e:
+                return {"success": False, "error": str(e)}
 
     def _next_interval_days(current_days: int | None) -> int:
         ladder = [1, 2, 4, 7, 15, 30, 60, 120]  # tavan: 120
@@ -286,7 +634,7 @@ class Database:
 
     def after_reminder_sent(self, rule_id: int, current_interval: int | None):
         new_interval = self._next_interval_days(current_interval)
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cur = conn.cursor()
             # Find entry_id for updating word_entries as well
             cur.execute("SELECT entry_id FROM reminder_rules WHERE id = ?", (rule_id,))
@@ -312,121 +660,185 @@ class Database:
             conn.commit()
 
     def get_due_reminders(self, limit=100):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT
-              rr.id           AS rule_id,
-              rr.user_id,
-              rr.interval_days,
-              u.email         AS email,
-              we.word         AS word
-            FROM reminder_rules rr
-            JOIN users       u  ON u.id = rr.user_id
-            JOIN word_entries we ON we.id = rr.entry_id
-            WHERE rr.is_active = 1
-              AND rr.next_run_at <= CURRENT_TIMESTAMP
-            ORDER BY rr.next_run_at ASC
-            LIMIT ?
-        """, (limit,))
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = sqlite3.Row
+            cur.execute(SQL_DUE_REMINDERS, (limit,))
+            return cur.fetchall()
 
     # Manual updates for reminder time are intentionally not supported; schedule is automatic.
 
-    def list_user_words(self, user_id: int, limit: int = 100, offset: int = 0, search: str | None = None):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
+    def list_user_words(self, user_id: int, limit: int = 100, offset: int = 0, search: str | None = None,
+                        after=None, before=None):
+        """
+        Kelimeleri yeniden eskiye (created_at DESC, id DESC) listeler.
+        after/before (created_at, id) anahtarlarıdır: after => bu anahtardan eski, before => bu anahtardan
+        yeni kayıtlar. (user_id, created_at) indeksinde doğrudan konumlanır; OFFSET'in aksine derin sayfalar
+        da ilk sayfa kadar ucuzdur.
+        """
+        with self._connection() as conn:
+            fts = bool(search) and self._use_word_search(conn, user_id, search)
+            sql, params, order = self._user_words_query(user_id, limit, offset, search, after, before, fts=fts)
+            cur = conn.cursor()
+            cur.row_factory = sqlite3.Row
+            cur.execute(sql, params)
+            rows = [dict(r) for r in cur.fetchall()]
 
-        if search:
-            cur.execute(
-                """SELECT id, word, created_at, next_reminder_at
-                   FROM word_entries
-                   WHERE user_id = ? AND word LIKE ?
-                   ORDER BY created_at DESC
-                   LIMIT ? OFFSET ?""",
-                (user_id, f"%{search}%", limit, offset)
-            )
+        return rows[::-1] if order == "ASC" else rows
+
+    def _use_word_search(self, conn, user_id, search):
+        """
+        Arama indeksi yalnızca LIKE'tan hızlı olacağı durumda kullanılır: kullanıcının kelimesi çoksa
+        (LIKE hepsini okur) ve terim seyrekse (LIKE sayfayı erken dolduramaz).
+        """
+        if not self.word_search or len(search) < FTS_MIN_QUERY:
+            return False
+        if conn.execute(SQL_USER_HAS_MANY_WORDS, (user_id, FTS_MIN_USER_WORDS)).fetchone() is None:
+            return False
+        lo, hi = _fts_rowid_range(user_id)
+        matches = conn.execute(SQL_WORD_SEARCH_MATCHES, (_fts_phrase(search), lo, hi, FTS_MAX_MATCHES + 1)).fetchall()
+        return len(matches) <= FTS_MAX_MATCHES
+
+    def _user_words_query(self, user_id, limit, offset=0, search=None, after=None, before=None, fts=False):
+        """list_user_words SQL'ini oluşturur: (sql, params, sıra yönü)"""
+        source = "word_entries we"
+        where = ["we.user_id = ?"]
+        params = [user_id]
+        if search and fts:
+            # Eşleşmeler yalnızca kullanıcının rowid aralığında aranır, entry id'ye çevrilip tabloya bağlanır
+            lo, hi = _fts_rowid_range(user_id)
+            source = """(SELECT rowid - ? AS id FROM word_entries_search
+                           WHERE word_entries_search MATCH ? AND rowid BETWEEN ? AND ?) m
+                          CROSS JOIN word_entries we ON we.id = m.id"""
+            params = [lo, _fts_phrase(search), lo, hi, *params]
+        elif search:
+            where.append("we.word LIKE ? ESCAPE '\\'")
+            params.append(f"%{_like_escape(search)}%")
+        if after:
+            where.append("(we.created_at, we.id) < (?, ?)")
+            params.extend(after)
+        elif before:
+            where.append("(we.created_at, we.id) > (?, ?)")
+            params.extend(before)
+        # Önceki sayfa için indeks ters yönde okunur, list_user_words sonucu yeniden sıralar
+        order = "ASC" if before and not after else "DESC"
+
+        sql = f"""SELECT we.id, we.word, we.created_at, we.next_reminder_at
+                  FROM {source}
+                  WHERE {" AND ".join(where)}
+                  ORDER BY we.created_at {order}, we.id {order}
+                  LIMIT ? OFFSET ?"""
+        return sql, (*params, limit, offset), order
+
+    def list_user_words_page(self, user_id: int, per_page: int = 50, search: str | None = None,
+                             after: str | None = None, before: str | None = None):
+        """
+        Keyset sayfalama. after/before önceki sayfadan gelen opak cursor'lardır.
+        {"words": [...], "next_cursor": str|None, "prev_cursor": str|None} döner.
+        """
+        after_key, before_key = decode_cursor(after), decode_cursor(before)
+        # Bir fazla kayıt istenir: varsa o yönde başka sayfa da vardır
+        rows = self.list_user_words(user_id, limit=per_page + 1, search=search,
+                                    after=after_key, before=None if after_key else before_key)
+        if before_key and not after_key:
+            has_prev, has_next = len(rows) > per_page, True
+            words = rows[-per_page:]
         else:
+            has_prev, has_next = after_key is not None, len(rows) > per_page
+            words = rows[:per_page]
+
+        return {
+            "words": words,
+            "next_cursor": encode_cursor(words[-1]) if words and has_next else None,
+            "prev_cursor": encode_cursor(words[0]) if words and has_prev else None,
+        }
+
+    def suggest_user_words(self, user_id: int, prefix: str, limit: int = 10):
+        """
+        Otomatik tamamlama: kullanıcının prefix ile başlayan kelimeleri (büyük/küçük harf duyarsız).
+        (user_id, word NOCASE) indeksinde [prefix, prefix'in ardılı) aralığı okunur; tablo taranmaz.
+        """
+        # NOCASE yalnızca ASCII harfleri küçültüp karşılaştırır; sınırlar da aynı şekilde küçültülür
+        prefix = "".join(ch.lower() if ch.isascii() else ch for ch in (prefix or "").strip())
+        if not prefix:
+            return []
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        with self._connection() as conn:
+            rows = conn.execute(SQL_SUGGEST_WORDS, (user_id, prefix, upper, limit)).fetchall()
+        return [row[0] for row in rows]
+
+    def list_entry_words(self, after_id: int = 0, limit: int = 100):
+        """Tüm kullanıcıların kelimelerini id sırasıyla parça parça getirir (toplu işler için)"""
+        with self._connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = sqlite3.Row
             cur.execute(
-                """SELECT id, word, created_at, next_reminder_at
-                   FROM word_entries
-                   WHERE user_id = ?
-                   ORDER BY created_at DESC
-                   LIMIT ? OFFSET ?""",
-                (user_id, limit, offset)
+                """SELECT id, word FROM word_entries
+                   WHERE id > ?
+                   ORDER BY id
+                   LIMIT ?""",
+                (after_id, limit)
             )
-
-        rows = [dict(r) for r in cur.fetchall()]
-        conn.close()
-        return rows
+            return [dict(r) for r in cur.fetchall()]
 
     def save_word_attempt(self, user_id, word, definition, category, level, is_correct):
         """Kullanıcının kelime denemesini kaydeder"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Daha önce bu kelimeyi denemiş mi kontrol et
-        cursor.execute('''
-            SELECT id, attempts FROM user_words 
-            WHERE user_id = ? AND word = ?
-        ''', (user_id, word))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Mevcut kaydı güncelle
-            new_attempts = existing[1] + 1
-            cursor.execute('''
-                UPDATE user_words 
-                SET attempts = ?, last_attempt_date = CURRENT_TIMESTAMP, is_correct = ?
-                WHERE id = ?
-            ''', (new_attempts, is_correct, existing[0]))
-        else:
-            # Yeni kayıt oluştur
-            cursor.execute('''
-                INSERT INTO user_words 
-                (user_id, word, definition, category, level, is_correct)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, word, definition, category, level, is_correct))
-        
-        # Kullanıcı istatistiklerini güncelle
-        if is_correct:
-            cursor.execute('''
-                UPDATE users 
-                SET total_correct_answers = total_correct_answers + 1,
-                    current_streak = current_streak + 1
-                WHERE id = ?
-            ''', (user_id,))
-        else:
-            cursor.execute('''
-                UPDATE users 
-                SET current_streak = 0
-                WHERE id = ?
-            ''', (user_id,))
-        
-        conn.commit()
-        conn.close()
-        return {"success": True}
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Daha önce bu kelimeyi denemiş mi kontrol et
+            cursor.execute(SQL_WORD_ATTEMPT, (user_id, word))
+            
+            existing = cursor.fetchone()
+            
+            if existing:
+                # Mevcut kaydı güncelle
+                new_attempts = existing[1] + 1
+                cursor.execute('''
+                    UPDATE user_words 
+                    SET attempts = ?, last_attempt_date = CURRENT_TIMESTAMP, is_correct = ?
+                    WHERE id = ?
+                ''', (new_attempts, is_correct, existing[0]))
+            else:
+                # Yeni kayıt oluştur
+                cursor.execute('''
+                    INSERT INTO user_words 
+                    (user_id, word, definition, category, level, is_correct)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (user_id, word, definition, category, level, is_correct))
+            
+            # Kullanıcı istatistiklerini güncelle
+            if is_correct:
+                cursor.execute('''
+                    UPDATE users 
+                    SET total_correct_answers = total_correct_answers + 1,
+                        current_streak = current_streak + 1
+                    WHERE id = ?
+                ''', (user_id,))
+            else:
+                cursor.execute('''
+                    UPDATE users 
+                    SET current_streak = 0
+                    WHERE id = ?
+                ''', (user_id,))
+            
+            conn.commit()
+            return {"success": True}
     
     def get_user_wrong_words(self, user_id, limit=10):
         """Kullanıcının yanlış yaptığı kelimeleri getirir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT word, definition, category, level, attempts, last_attempt_date
-            FROM user_words 
-            WHERE user_id = ? AND is_correct = 0
-            ORDER BY last_attempt_date DESC
-            LIMIT ?
-        ''', (user_id, limit))
-        
-        words = cursor.fetchall()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT word, definition, category, level, attempts, last_attempt_date
+                FROM user_words 
+                WHERE user_id = ? AND is_correct = 0
+                ORDER BY last_attempt_date DESC
+                LIMIT ?
+            ''', (user_id, limit))
+            
+            words = cursor.fetchall()
         
         return [
             {
@@ -442,18 +854,17 @@ class Database:
     
     def get_user_stats(self, user_id):
         """Kullanıcı istatistiklerini getirir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT total_words_learned, total_correct_answers, current_streak,
-                   (SELECT COUNT(*) FROM user_words WHERE user_id = ? AND is_correct = 0) as wrong_words,
-                   (SELECT COUNT(*) FROM user_words WHERE user_id = ?) as total_attempts
-            FROM users WHERE id = ?
-        ''', (user_id, user_id, user_id))
-        
-        stats = cursor.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT total_words_learned, total_correct_answers, current_streak,
+                       (SELECT COUNT(*) FROM user_words WHERE user_id = ? AND is_correct = 0) as wrong_words,
+                       (SELECT COUNT(*) FROM user_words WHERE user_id = ?) as total_attempts
+                FROM users WHERE id = ?
+            ''', (user_id, user_id, user_id))
+            
+            stats = cursor.fetchone()
         
         if stats:
             return {
@@ -468,50 +879,59 @@ class Database:
         return None
     
     def save_hobby_words(self, hobby, words):
-        """Hobi bazlı kelimeleri kaydeder"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        for word_data in words:
-            cursor.execute('''
-                INSERT OR REPLACE INTO hobby_words (hobby, word, definition, level)
+        """Hobi bazlı kelimeleri kaydeder (aynı kelime tekrar gelirse tanımı/seviyesi güncellenir)"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO hobby_words (hobby, word, definition, level)
                 VALUES (?, ?, ?, ?)
-            ''', (hobby, word_data['word'], word_data['definition'], word_data['level']))
-        
-        conn.commit()
-        conn.close()
+                ON CONFLICT(hobby, word) DO UPDATE SET
+                    definition = excluded.definition,
+                    level = excluded.level
+            ''', [(hobby, w['word'], w['definition'], w['level']) for w in words])
+            
+            conn.commit()
+
+        with self._hobby_lock:
+            self._hobby_cache.pop(hobby, None)
         return {"success": True}
+
+    def _hobby_vocabulary(self, hobby):
+        """Hobinin kelimeleri seviye bazında listeler halinde (None => tümü); süreç içinde önbelleklenir"""
+        now = time.monotonic()
+        with self._hobby_lock:
+            cached = self._hobby_cache.get(hobby)
+        if cached and now - cached[0] < HOBBY_CACHE_TTL:
+            return cached[1]
+
+        with self._connection() as conn:
+            rows = conn.execute(SQL_HOBBY_VOCABULARY, (hobby,)).fetchall()
+
+        vocabulary = {None: []}
+        for word, definition, level in rows:
+            item = {"word": word, "definition": definition, "level": level, "category": hobby}
+            vocabulary[None].append(item)
+            vocabulary.setdefault(level, []).append(item)
+        # Boş sonuç önbelleğe alınmaz: kelimeler üretilip kaydedilince hemen görünsün
+        if rows:
+            with self._hobby_lock:
+                self._hobby_cache[hobby] = (now, vocabulary)
+        return vocabulary
     
     def get_hobby_words(self, hobby, level=None, limit=50):
-        """Hobi bazlı kelimeleri getirir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if level:
-            cursor.execute('''
-                SELECT word, definition, level FROM hobby_words 
-                WHERE hobby = ? AND level = ?
-                ORDER BY RANDOM() LIMIT ?
-            ''', (hobby, level, limit))
-        else:
-            cursor.execute('''
-                SELECT word, definition, level FROM hobby_words 
-                WHERE hobby = ?
-                ORDER BY RANDOM() LIMIT ?
-            ''', (hobby, limit))
-        
-        words = cursor.fetchall()
-        conn.close()
-        
-        return [
-            {
-                "word": word[0],
-                "definition": word[1],
-                "level": word[2],
-                "category": hobby
-            }
-            for word in words
-        ]
+        """Hobi bazlı kelimeleri rastgele sırayla getirir (sıcak yolda SQLite'a gidilmez)"""
+        words = self._hobby_vocabulary(hobby).get(level or None, [])
+        return [dict(w) for w in random.sample(words, min(limit, len(words)))]
 
 
+if __name__ == '__main__':
+    import sys
 
+    # python database.py check-plans  => sık sorgulardan biri tam tarama yapıyorsa çıkış kodu 1
+    if sys.argv[1:] == ["check-plans"]:
+        results = Database().check_query_plans()
+        for name, result in results.items():
+            print(f"{'❌' if result['full_scan'] else '✅'} {name}: {' | '.join(result['plan'])}")
+        sys.exit(1 if any(r["full_scan"] for r in results.values()) else 0)
+    print("Kullanım: python database.py check-plans")
@@ -9,6 +9,11 @@ import os
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from dotenv import load_dotenv
+
+# SMTP_* ve DB_* ayarları import anında okunur; .env önce yüklenir
+load_dotenv()
+
 from email_service import email_service
 from database import Database
 from datetime import datetime, timedelta
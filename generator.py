@@ -1,19 +1,38 @@
-from nltk.stem import PorterStemmer, LancasterStemmer
-from nltk.corpus import words # Import words here
-import nltk
-from nltk.corpus import wordnet as wn
-nltk.download('words') # Ensure words is downloaded here
-import analyzer, translate
+import analyzer, translate, wordindex
 import google.generativeai as genai
 import os,api_k
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+from cache import TieredCache, make_key
+from singleflight import SingleFlight
 genai.configure(api_key=api_k.api_key)
 model = genai.GenerativeModel('gemini-1.5-flash-latest')
 
-english_words = set(words.words())
+# Fiil olmayan kelimeler için üretilecek örnek sayısı
+EXAMPLE_COUNT = 5
+
+# 1 ise tanım ve örnekler tek bir JSON yanıtıyla istenir (LLM round-trip sayısı yarıya iner)
+STRUCTURED_OUTPUT = os.getenv("GENERATOR_STRUCTURED_OUTPUT", "0") == "1"
+
+# Aynı (lemma, tür, ilgi alanları, seviye) için üretilen sonuçların önbelleği
+generation_cache = TieredCache(
+    db_path=os.getenv("GENERATION_CACHE_DB", "generation_cache.db"),
+    table="generations",
+    max_entries=int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", 50000)),
+    memory_entries=int(os.getenv("GENERATION_CACHE_MEMORY_ENTRIES", 512)),
+    ttl_seconds=int(os.getenv("GENERATION_CACHE_TTL", 7 * 24 * 3600)),
+)
+
+# Aynı kelime/cümle için eşzamanlı istekler tek bir analiz + LLM + çeviri hattını paylaşır
+_generations = SingleFlight()
+
+# generate_sentences içindeki bağımsız LLM/çeviri adımları için paylaşılan thread havuzu
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("GENERATOR_WORKERS", 8)), thread_name_prefix="generator")
 
 def is_english_word(word):
-    porter = PorterStemmer()
-    return bool(wn.synsets(word)or(wn.synsets(porter.stem(word))))
+    # Önceden derlenmiş WordNet indeksi: O(1) arama, WordNet korpusu yüklenmez
+    return wordindex.is_english_word(word)
 
 def construct_word(text,sentence):
   #check it is an english word or not
@@ -38,10 +57,26 @@ def construct_word(text,sentence):
       raise
 
 
-def generate_sentences(word,sample_sentence, tenses,interests):
+def generate_sentences(word,sample_sentence, tenses,interests, structured=None, fresh=False):
     """
     Tek bir prompt ile verilen kelime için tüm zamanlarda örnek cümleler üretir.
+    structured=True ise tanım ve örnekler tek bir JSON yanıtı olarak istenir.
+    fresh=True ise önbellek atlanır ve yeni örnekler üretilir (sonuç yine önbelleğe yazılır).
     """
+    if structured is None:
+        structured = STRUCTURED_OUTPUT
+    flight_key = (
+        word.strip().casefold(), sample_sentence.strip(), tuple(tenses),
+        tuple(sorted(set(interests))), structured, fresh
+    )
+    info, examples = _generations.do(
+        flight_key, _generate_sentences, word, sample_sentence, tenses, interests, structured, fresh
+    )
+    # Aynı uçuşu bekleyen çağıranlar aynı nesneleri alır; her çağırana kendi kopyası verilir
+    return copy.deepcopy(info), copy.deepcopy(examples)
+
+
+def _generate_sentences(word, sample_sentence, tenses, interests, structured, fresh):
     try:
         print(f"Starting generate_sentences with word: {word}, sample: {sample_sentence}")
         level="b1"
@@ -56,6 +91,52 @@ def generate_sentences(word,sample_sentence, tenses,interests):
         print(f"Error in generate_sentences setup: {e}")
         raise
 
+    cache_key = make_key(
+        "generate", lemma, tag, sorted(set(interests)), level,
+        tenses if tag == "verb" else EXAMPLE_COUNT, structured, translate.TRANSLATE_MODE
+    )
+    if not fresh:
+        cached = generation_cache.get(cache_key)
+        if cached is not None:
+            print(f"Generation cache hit for {lemma} ({tag})")
+            return cached["info"], cached["examples"]
+
+    if structured:
+        info, examples = _generate_structured(model, lemma, tag, tenses, tense_list, interests_list, level)
+    else:
+        info, examples = _generate_concurrent(model, lemma, tag, tenses, tense_list, interests_list, level)
+
+    # Hatalı/eksik sonuçlar önbelleğe yazılmaz, bir sonraki istek tekrar dener
+    if _is_complete(info, examples, len(tenses) if tag == "verb" else EXAMPLE_COUNT):
+        generation_cache.set(cache_key, {"info": info, "examples": examples})
+    return info, examples
+
+
+def _is_complete(info, examples, expected):
+    # Eksik örnekli (ör. 5 yerine 3 cümle) ya da çevirisi başarısız sonuçlar tamamlanmış sayılmaz
+    return (
+        len(examples) == expected
+        and all("turkish" in item for item in examples)
+        and not info["eng"].startswith("Could not retrieve info")
+    )
+
+
+def _generate_concurrent(model, lemma, tag, tenses, tense_list, interests_list, level):
+    # Tanım ve örnek cümleler birbirinden bağımsız: iki LLM çağrısı (ve tanımın çevirisi)
+    # aynı anda çalışır, toplam süre ikisinin toplamı değil en yavaşı kadar olur
+    info_future = _executor.submit(_generate_info, model, lemma, tag)
+    examples_future = _executor.submit(_generate_examples, model, lemma, tag, tenses, tense_list, interests_list, level)
+    return info_future.result(), examples_future.result()
+
+
+def _generate_info(model, lemma, tag):
+    clean_eng = _request_definition(model, lemma, tag)
+    turkish_inf=translate.translate_tur(clean_eng)
+    # Return lemma so UI can display the root form (e.g., balls -> ball)
+    return {"eng":clean_eng,"tur":turkish_inf,"type":tag, "lemma": lemma}
+
+
+def _request_definition(model, lemma, tag):
     info_prompt = (
     f"Explain the English word '{lemma}' only in its role as a {tag}. "
     f"Provide a short and clear English definition (one sentence). "
@@ -70,12 +151,10 @@ def generate_sentences(word,sample_sentence, tenses,interests):
     except Exception as e:
         word_info = f"Could not retrieve info: {e}"
     #Promptan definiton: kısmını silmek istiyorum
-    clean_eng = word_info.replace("Definition:", "", 1).strip()
-    turkish_inf=translate.translate_tur(clean_eng)
-    # Return lemma so UI can display the root form (e.g., balls -> ball)
-    info={"eng":clean_eng,"tur":turkish_inf,"type":tag, "lemma": lemma}
+    return word_info.replace("Definition:", "", 1).strip()
 
 
+def _generate_examples(model, lemma, tag, tenses, tense_list, interests_list, level):
     if tag=="verb":
         prompt = (
               f"Generate exactly one English sentence for each of the following tenses: {tense_list}. "
@@ -90,17 +169,18 @@ def generate_sentences(word,sample_sentence, tenses,interests):
         try:
           response = model.generate_content(prompt)
           lines = [ln.strip() for ln in response.text.split("\n") if ln.strip()]
-          generated_sentences = []
-          for tense, sentence in zip(tenses, lines):
-                turkish=translate.translate_tur(sentence)
-                generated_sentences.append({"tense": tense, "sentence": sentence,"turkish":turkish})
+          generated_sentences = [
+              {"tense": tense, "sentence": sentence} for tense, sentence in zip(tenses, lines)
+          ]
+          to_translate = generated_sentences
         except Exception as e:
           print(f"Error generating sentences: {e}")
           generated_sentences = [
               {"tense": tense, "sentence": f"Error generating sentence: {e}"} for tense in tenses
           ]
+          to_translate = []
     else:
-        k = 5  # kaç örnek istiyorsan
+        k = EXAMPLE_COUNT
         prompt = (
               f"Generate {k} different English sentences suitable for a {level} learner of English. "
               f"Each sentence must use the word '{lemma}' as a {tag}. "
@@ -117,15 +197,149 @@ def generate_sentences(word,sample_sentence, tenses,interests):
             # fazlaysa kırp, eksikse olduğu kadarını al
             lines = lines[:k]
 
-            generated_sentences = []
-            for i, sentence in enumerate(lines, start=1):
-                turkish=translate.translate_tur(sentence)
-                generated_sentences.append({"example": i, "sentence": sentence,"turkish":turkish})
+            generated_sentences = [
+                {"example": i, "sentence": sentence} for i, sentence in enumerate(lines, start=1)
+            ]
+            to_translate = generated_sentences
 
         except Exception as e:
             print(f"Error generating sentences: {e}")
             generated_sentences = [{"example": i + 1, "sentence": f"Error: {e}"} for i in range(k)]
+            to_translate = []
+
+    # Örnek cümleler tek bir batch çeviri çağrısıyla çevrilir
+    turkish_all = translate.translate_tur_batch([item["sentence"] for item in to_translate])
+    for item, turkish in zip(to_translate, turkish_all):
+        item["turkish"] = turkish
 
-    return info,generated_sentences
+    return generated_sentences
 
 
+
+
+def _generate_structured(model, lemma, tag, tenses, tense_list, interests_list, level):
+    """Tanım ve örnekleri tek bir JSON yanıtıyla ister; eksik kalan kısımlar için yalnızca onları tekrar sorar."""
+    if tag == "verb":
+        examples_spec = (
+            f"exactly one sentence for each of these tenses: {tense_list}, "
+            f"each as {{\"tense\": <tense name exactly as given>, \"sentence\": <sentence>}}"
+        )
+    else:
+        examples_spec = (
+            f"{EXAMPLE_COUNT} different sentences, "
+            f"each as {{\"example\": <number starting from 1>, \"sentence\": <sentence>}}"
+        )
+    prompt = (
+        f"You are helping a {level} learner of English with the word '{lemma}' used as a {tag}. "
+        f"Return only a JSON object, with no markdown and no extra text, of the form "
+        f"{{\"definition\": <short and clear English definition in one sentence, only for its role as a {tag}>, "
+        f"\"examples\": [...]}}. "
+        f"The examples list must contain {examples_spec}. "
+        f"Each sentence must use the word '{lemma}' as a {tag}, with grammar and vocabulary appropriate for {level} level. "
+        f"For each sentence, choose a different theme from this list of interests: {interests_list}."
+    )
+
+    definition, examples = None, ({} if tag == "verb" else [])
+    try:
+        response = model.generate_content(prompt)
+        definition, examples = _validate_structured(_parse_json(response.text), tag, tenses)
+    except Exception as e:
+        print(f"Structured generation failed, retrying missing parts: {e}")
+
+    # Şemaya uymayan ya da eksik kalan kısımlar için yalnızca onları tekrar iste
+    if not definition:
+        definition = _request_definition(model, lemma, tag)
+    if tag == "verb":
+        missing = [tense for tense in tenses if tense not in examples]
+        if missing:
+            examples.update(_request_missing_examples(model, lemma, tag, missing, interests_list, level))
+        generated_sentences = [
+            {"tense": tense, "sentence": examples[tense]} for tense in tenses if tense in examples
+        ]
+    else:
+        missing = EXAMPLE_COUNT - len(examples)
+        if missing > 0:
+            examples += _request_missing_examples(model, lemma, tag, missing, interests_list, level)[:missing]
+        generated_sentences = [
+            {"example": i, "sentence": sentence} for i, sentence in enumerate(examples, start=1)
+        ]
+
+    # Tanım ve örnekler tek bir batch çeviri çağrısıyla çevrilir
+    turkish_all = translate.translate_tur_batch([definition] + [item["sentence"] for item in generated_sentences])
+    for item, turkish in zip(generated_sentences, turkish_all[1:]):
+        item["turkish"] = turkish
+
+    info = {"eng": definition, "tur": turkish_all[0], "type": tag, "lemma": lemma}
+    return info, generated_sentences
+
+
+def _parse_json(text):
+    # Model bazen ```json ... ``` bloğu içinde döndürür; ilk '{' ile son '}' arasını al
+    text = (text or "").strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("Response does not contain a JSON object")
+    return json.loads(text[start:end + 1])
+
+
+def _validate_structured(data, tag, tenses):
+    """
+    Yanıtı beklenen şemaya göre doğrular:
+    {"definition": str, "examples": [{"tense"|"example": ..., "sentence": str}, ...]}
+    Geçerli tanımı (yoksa None) ve geçerli örnekleri döndürür:
+    fiiller için {tense: sentence}, diğerleri için numara sırasına göre cümle listesi.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Response JSON is not an object")
+
+    definition = data.get("definition")
+    if not isinstance(definition, str) or not definition.strip():
+        definition = None
+    else:
+        definition = definition.replace("Definition:", "", 1).strip()
+
+    items = data.get("examples")
+    if not isinstance(items, list):
+        items = []
+    valid = [
+        item for item in items
+        if isinstance(item, dict) and isinstance(item.get("sentence"), str) and item["sentence"].strip()
+    ]
+
+    if tag == "verb":
+        wanted = {t.lower(): t for t in tenses}
+        examples = {}
+        for item in valid:
+            tense = wanted.get(str(item.get("tense", "")).strip().lower())
+            if tense and tense not in examples:
+                examples[tense] = item["sentence"].strip()
+        return definition, examples
+
+    # Numarası olmayan ya da geçersiz olanlar geldiği sırada sona eklenir
+    valid.sort(key=lambda item: item["example"] if isinstance(item.get("example"), int) else float("inf"))
+    return definition, [item["sentence"].strip() for item in valid][:EXAMPLE_COUNT]
+
+
+def _request_missing_examples(model, lemma, tag, missing, interests_list, level):
+    """Yalnızca eksik örnekleri ister: fiiller için eksik zamanlar, diğerleri için eksik örnek sayısı."""
+    if tag == "verb":
+        spec = (
+            f"exactly one sentence for each of these tenses: {', '.join(missing)}, "
+            f"each as {{\"tense\": <tense name exactly as given>, \"sentence\": <sentence>}}"
+        )
+    else:
+        spec = f"{missing} different sentences, each as {{\"example\": <number>, \"sentence\": <sentence>}}"
+    prompt = (
+        f"Return only a JSON object, with no markdown and no extra text, of the form {{\"examples\": [...]}}. "
+        f"The examples list must contain {spec}. "
+        f"Each sentence must use the English word '{lemma}' as a {tag}, "
+        f"with grammar and vocabulary appropriate for {level} level, "
+        f"and each must use a different theme from this list of interests: {interests_list}."
+    )
+    try:
+        response = model.generate_content(prompt)
+        _, found = _validate_structured(_parse_json(response.text), tag, missing if tag == "verb" else [])
+        return found
+    except Exception as e:
+        print(f"Error generating missing examples: {e}")
+        return {} if tag == "verb" else []
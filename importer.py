@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Toplu kelime içe aktarma.
+CSV (kelime, bağlam cümlesi) veya Kindle 'My Clippings.txt' dosyalarını satır satır okur,
+partiler halinde doğrular/lemmatize eder ve word_entries'e parça parça transaction'larla yazar.
+Kullanım: python importer.py --email user@example.com kelimeler.csv [--format csv|clippings]
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# IMPORT_* ve DB_* ayarları import anında okunur; .env önce yüklenir
+load_dotenv()
+
+import analyzer
+import wordindex
+
+BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 500))
+
+# CSV başlığında kelime ve bağlam cümlesi için kabul edilen sütun adları
+WORD_COLUMNS = {"word", "kelime", "term"}
+SENTENCE_COLUMNS = {"sentence", "context", "usage", "example", "cümle"}
+
+CLIPPING_SEPARATOR = "=========="
+
+
+def parse_csv(lines):
+    """(kelime, cümle) çiftlerini üretir. Başlık yoksa ilk sütun kelime, ikinci sütun cümle kabul edilir."""
+    reader = csv.reader(lines)
+    word_idx, sentence_idx = 0, 1
+    for i, row in enumerate(reader):
+        if not row:
+            continue
+        if i == 0:
+            header = [col.strip().lower() for col in row]
+            if WORD_COLUMNS & set(header):
+                word_idx = next(j for j, col in enumerate(header) if col in WORD_COLUMNS)
+                sentence_idx = next((j for j, col in enumerate(header) if col in SENTENCE_COLUMNS), None)
+                continue
+        word = row[word_idx].strip() if len(row) > word_idx else ""
+        sentence = row[sentence_idx].strip() if sentence_idx is not None and len(row) > sentence_idx else ""
+        yield word, sentence
+
+
+def parse_clippings(lines):
+    """
+    Kindle 'My Clippings.txt' formatı: her kayıt başlık, meta satırı, boş satır ve vurgulanan metinden oluşur.
+    Yalnızca tek kelimelik vurgular kelime olarak alınır; bağlam cümlesi olmadığından cümle boş döner.
+    """
+    block = []
+    for line in lines:
+        line = line.strip()
+        if line != CLIPPING_SEPARATOR:
+            block.append(line)
+            continue
+        text = " ".join(part for part in block[2:] if part)
+        block = []
+        word = text.strip(".,;:!?\"'()[]")
+        if word and len(word.split()) == 1:
+            yield word, ""
+
+
+PARSERS = {"csv": parse_csv, "clippings": parse_clippings}
+
+
+def detect_format(filename):
+    return "clippings" if (filename or "").lower().endswith(".txt") else "csv"
+
+
+def _prepare_batch(batch):
+    """Geçersizleri ayıklar, lemmaları çıkarır ve parti içi tekrarları (büyük/küçük harf duyarsız) atar."""
+    valid = [(word, sentence) for word, sentence in batch if word and wordindex.is_english_word(word)]
+    # Bağlam cümlesi yoksa ya da kelimeyi içermiyorsa kelimenin kendisi analiz edilir
+    pairs = [(word, sentence if word.lower() in sentence.lower() else word) for word, sentence in valid]
+
+    lemmas = {}
+    for (word, _), result in zip(pairs, analyzer.analyze_many(pairs)):
+        lemma = (result.get("lemma") or word).strip().casefold()
+        lemmas.setdefault(lemma, None)
+    return list(lemmas), len(batch) - len(valid)
+
+
+def import_words(db, user_id, rows, batch_size=BATCH_SIZE):
+    """
+    (kelime, cümle) akışını içe aktarır; her parti sonrası ilerleme sözlüğü üretir (generator).
+    Bellek kullanımı parti boyutuyla sınırlıdır.
+    """
+    progress = {"processed": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+
+    def flush(batch):
+        words, invalid = _prepare_batch(batch)
+        result = db.add_word_entries_bulk(user_id, words)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        progress["processed"] += len(batch)
+        progress["inserted"] += result["inserted"]
+        # Parti içi tekrarlar da duplicate sayılır
+        progress["duplicates"] += len(batch) - invalid - result["inserted"]
+        progress["invalid"] += invalid
+        return dict(progress)
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield flush(batch)
+            batch = []
+    if batch:
+        yield flush(batch)
+
+    yield dict(progress, done=True)
+
+
+def main():
+    from database import Database
+
+    parser = argparse.ArgumentParser(description="Bulk word import")
+    parser.add_argument("path")
+    parser.add_argument("--email", required=True, help="Kelimelerin ekleneceği kullanıcı")
+    parser.add_argument("--format", choices=sorted(PARSERS))
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = Database()
+    user_id = db.get_user_id_by_email(args.email)
+    if user_id is None:
+        print(f"❌ Kullanıcı bulunamadı: {args.email}")
+        sys.exit(1)
+
+    fmt = args.format or detect_format(args.path)
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        for progress in import_words(db, user_id, PARSERS[fmt](f), args.batch_size):
+            print(f"📥 {progress['processed']} satır | {progress['inserted']} eklendi | "
+                  f"{progress['duplicates']} tekrar | {progress['invalid']} geçersiz")
+    print("✅ İçe aktarma tamamlandı")
+
+
+if __name__ == "__main__":
+    main()
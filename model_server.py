@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Yerel model sunucusu: çeviri ve TTS modellerini tek bir süreçte tutar, web worker'larına Unix socket
+üzerinden hizmet eder. Farklı worker'lardan aynı anda gelen istekler tek bir model çağrısında birleştirilir
+(micro-batching). MODEL_SERVER_SOCKET tanımlıysa app.py worker'ları model yüklemez, istemci olarak çalışır;
+böylece worker sayısı model belleğinden bağımsız artırılabilir.
+Kullanım: python model_server.py [--socket /tmp/wordmaster-models.sock]
+"""
+
+import argparse
+import os
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+
+from dotenv import load_dotenv
+
+# MODEL_SERVER_* ve model modüllerinin ayarları import anında okunur; .env önce yüklenir
+load_dotenv()
+
+MODEL_SERVER_SOCKET = os.getenv("MODEL_SERVER_SOCKET")
+# Paylaşılan anahtar zorunludur: bağlantılar HMAC ile doğrulanır, doğrulanmamış istemcinin pickle verisi açılmaz.
+# Ortam değişkeni yoksa anahtar dosyadan okunur; dosyayı sunucu ilk açılışta 0600 izniyle üretir
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY")
+MODEL_SERVER_AUTHKEY_FILE = os.getenv("MODEL_SERVER_AUTHKEY_FILE", ".model_server_key")
+# Yanıt için en fazla bekleme süresi (saniye)
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", 60))
+# Micro-batching: ilk istekten sonra diğer çağıranlar için beklenen süre ve tek geçişteki en fazla metin
+MODEL_SERVER_BATCH_WAIT_MS = float(os.getenv("MODEL_SERVER_BATCH_WAIT_MS", 5))
+MODEL_SERVER_MAX_BATCH = int(os.getenv("MODEL_SERVER_MAX_BATCH", 16))
+
+# Sunucu sürecinde True olur: sunucu aynı ortam değişkenini okusa da modelleri yerelde çalıştırır
+_serving = False
+
+
+class ModelServerError(RuntimeError):
+    """Model sunucusuna ulaşılamadı ya da sunucu hata döndürdü."""
+
+
+def enabled():
+    """Bu süreç modeller için uzaktaki sunucuyu mu kullanıyor?"""
+    return bool(MODEL_SERVER_SOCKET) and not _serving
+
+
+def _authkey(create=False):
+    if MODEL_SERVER_AUTHKEY:
+        return MODEL_SERVER_AUTHKEY.encode()
+    path = MODEL_SERVER_AUTHKEY_FILE
+    if create and not os.path.exists(path):
+        # Geçici dosyaya yazıp link ile atomik olarak yerleştir (app.py'deki .secret_key ile aynı yöntem)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+    try:
+        with open(path) as f:
+            return f.read().strip().encode()
+    except FileNotFoundError:
+        raise ModelServerError(
+            f"Model server key not found at {path}; start model_server.py first or set MODEL_SERVER_AUTHKEY"
+        )
+
+
+# ---------------------------------------------------------------------------
+# İstemci (web worker'ları)
+# ---------------------------------------------------------------------------
+
+class ModelClient:
+    """
+    Thread başına kalıcı bağlantı (Connection nesneleri thread-safe değildir).
+    Fork sonrası devralınan bağlantılar kullanılmaz; her süreç kendi bağlantısını açar.
+    """
+
+    def __init__(self, address, authkey=None, timeout=MODEL_SERVER_TIMEOUT):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _drop(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None and self._local.pid == os.getpid():
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def call(self, op, *args):
+        # Sunucu yeniden başlatıldıysa bir kez yeniden bağlanılır (istekler idempotent)
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send((op, args))
+                if not conn.poll(self.timeout):
+                    self._drop()
+                    raise ModelServerError(f"Model server timed out after {self.timeout}s")
+                status, result = conn.recv()
+                break
+            except (OSError, EOFError) as e:
+                self._drop()
+                if attempt:
+                    raise ModelServerError(f"Model server unreachable: {e}") from e
+        if status != "ok":
+            raise ModelServerError(result)
+        return result
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ModelClient(MODEL_SERVER_SOCKET, _authkey())
+    return _client
+
+
+def translate(sentences, mode):
+    """Normalize edilmiş cümleleri sunucuda çevirir (önbellek kontrolü istemcide yapılır)."""
+    return get_client().call("translate", list(sentences), mode)
+
+
+def synthesize(texts_norm):
+    """Normalize edilmiş metinlerin WAV seslerini sunucuda üretir."""
+    return get_client().call("tts", list(texts_norm))
+
+
+def ping():
+    return get_client().call("ping")
+
+
+def wait_ready(timeout=MODEL_SERVER_TIMEOUT, interval=0.5):
+    """Sunucu modellerini yükleyip dinlemeye başlayana kadar bekler (warmup/readiness için)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return ping()
+        except ModelServerError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(interval)
+
+
+# ---------------------------------------------------------------------------
+# Sunucu
+# ---------------------------------------------------------------------------
+
+class _Job:
+    def __init__(self, group, items):
+        self.group = group
+        self.items = items
+        self.future = Future()
+
+
+class _Batcher:
+    """
+    Farklı bağlantılardan gelen işleri kısa bir pencere boyunca toplar, aynı gruptakileri (ör. çeviri modu)
+    birleştirip tekrarları atar ve tek bir model çağrısıyla çalıştırır. Model başına tek thread:
+    aynı anda en fazla bir çıkarım.
+    """
+
+    def __init__(self, name, run, max_batch=MODEL_SERVER_MAX_BATCH, wait_ms=MODEL_SERVER_BATCH_WAIT_MS):
+        self.name = name
+        self._run = run
+        self.max_batch = max_batch
+        self.wait = wait_ms / 1000.0
+        self._queue = queue.Queue()
+        threading.Thread(target=self._loop, name=f"batcher-{name}", daemon=True).start()
+
+    def submit(self, group, items):
+        job = _Job(group, items)
+        self._queue.put(job)
+        return job.future
+
+    def _collect(self):
+        jobs = [self._queue.get()]
+        size = len(jobs[0].items)
+        deadline = time.monotonic() + self.wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            jobs.append(job)
+            size += len(job.items)
+        return jobs
+
+    def _loop(self):
+        while True:
+            by_group = {}
+            for job in self._collect():
+                by_group.setdefault(job.group, []).append(job)
+            for group, jobs in by_group.items():
+                try:
+                    results = self._run_group(group, [item for job in jobs for item in job.items])
+                except Exception as e:
+                    for job in jobs:
+                        job.future.set_exception(e)
+                    continue
+                for job in jobs:
+                    job.future.set_result([results[item] for item in job.items])
+
+    def _run_group(self, group, items):
+        unique = list(dict.fromkeys(items))
+        results = {}
+        for start in range(0, len(unique), self.max_batch):
+            chunk = unique[start:start + self.max_batch]
+            results.update(zip(chunk, self._run(group, chunk)))
+        return results
+
+
+def _load_models():
+    import sound
+    import translate as translate_module
+    translate_module._ensure_model_loaded()
+    # İlk gerçek isteğin soğuk başlangıç maliyeti ödememesi için TTS bir kez çalıştırılır
+    sound._synthesize_core("hello")
+
+
+def _make_handlers():
+    import sound
+    import translate as translate_module
+
+    translate_batcher = _Batcher("translate", lambda mode, texts: translate_module._translate_uncached(texts, mode))
+    tts_batcher = _Batcher("tts", lambda _, texts: sound._synthesize_batch(texts))
+    return {
+        "ping": lambda: {"pid": os.getpid(), "ready": True},
+        "translate": lambda texts, mode: translate_batcher.submit(mode, texts).result(),
+        "tts": lambda texts: tts_batcher.submit(None, texts).result(),
+    }
+
+
+def _serve_connection(conn, handlers):
+    with conn:
+        while True:
+            try:
+                op, args = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                reply = ("ok", handlers[op](*args))
+            except Exception as e:
+                reply = ("error", f"{type(e).__name__}: {e}")
+            try:
+                conn.send(reply)
+            except OSError:
+                return
+
+
+def serve(address):
+    """Modelleri yükler, ardından socket'i dinler; bağlantı başına bir thread."""
+    global _serving
+    _serving = True
+
+    start = time.perf_counter()
+    _load_models()
+    handlers = _make_handlers()
+    print(f"✅ Modeller yüklendi ({time.perf_counter() - start:.2f}s)")
+
+    authkey = _authkey(create=True)
+    # Önceki çalışmadan kalan socket dosyası dinlemeyi engeller
+    if os.path.exists(address):
+        os.unlink(address)
+    # Socket yalnızca sahibine açık oluşturulur (bind ile chmod arasında açık pencere kalmaz)
+    old_umask = os.umask(0o177)
+    try:
+        listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    finally:
+        os.umask(old_umask)
+    with listener:
+        print(f"🧠 Model sunucusu dinliyor: {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                # Hatalı kimlik doğrulama vb. tek bağlantıyı etkiler, sunucuyu değil
+                print(f"Model server accept error: {e}")
+                continue
+            threading.Thread(target=_serve_connection, args=(conn, handlers), daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared translator/TTS model server")
+    parser.add_argument("--socket", default=MODEL_SERVER_SOCKET or "/tmp/wordmaster-models.sock")
+    args = parser.parse_args()
+    serve(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+NLTK kaynaklarının tek seferlik kurulumu.
+Kaynaklar sabit bir veri dizinine indirilir ve doğrulanır; import sırasında ağa çıkılmaz,
+yalnızca yerel varlık kontrolü yapılır. Ardından İngilizce kelime indeksi (wordindex) derlenir.
+Kullanım: python nltk_setup.py   (eksikleri indirir, doğrular ve indeksi derler)
+"""
+
+import os
+import sys
+import nltk
+
+NLTK_DATA_DIR = os.getenv(
+    "NLTK_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "nltk_data"),
+)
+
+# Paket adı -> nltk.data.find yolu
+RESOURCES = {
+    "wordnet": "corpora/wordnet",
+    "averaged_perceptron_tagger_eng": "taggers/averaged_perceptron_tagger_eng",
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+}
+
+# Sabit dizin arama yolunun başına eklenir, böylece her ortamda aynı kaynaklar kullanılır
+if NLTK_DATA_DIR not in nltk.data.path:
+    nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+
+def _present(path):
+    try:
+        nltk.data.find(path)
+        return True
+    except LookupError:
+        return False
+
+
+def missing_resources(names=None):
+    return [name for name in (names or RESOURCES) if not _present(RESOURCES[name])]
+
+
+def ensure_resources(names=None):
+    """Kaynakların yerelde olduğunu doğrular (ağ erişimi yok); eksik varsa LookupError fırlatır."""
+    missing = missing_resources(names)
+    if missing:
+        raise LookupError(
+            f"Missing NLTK resources: {', '.join(missing)}. "
+            f"Run 'python nltk_setup.py' to install them into {NLTK_DATA_DIR}"
+        )
+
+
+def bootstrap(names=None):
+    """Eksik kaynakları NLTK_DATA_DIR'e indirir; indirildikten sonra hâlâ eksik olanları döndürür."""
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
+    for name in missing_resources(names):
+        print(f"⬇️  {name} indiriliyor...")
+        nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True, raise_on_error=True)
+    return missing_resources(names)
+
+
+if __name__ == "__main__":
+    print(f"📂 NLTK veri dizini: {NLTK_DATA_DIR}")
+    missing = bootstrap()
+    if missing:
+        print(f"❌ Doğrulanamayan kaynaklar: {', '.join(missing)}")
+        sys.exit(1)
+    for name in RESOURCES:
+        print(f"✅ {name}")
+
+    import wordindex
+    if not wordindex.index_ready():
+        print("🔨 İngilizce kelime indeksi derleniyor...")
+        wordindex.build_index()
+    print(f"✅ wordindex: {wordindex.INDEX_PATH}")
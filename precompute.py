@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Telaffuz seslerinin arka planda önceden hesaplanması.
+Kaydedilen kelime, lemması ve örnek cümleleri düşük öncelikle sentezlenip önbelleğe yazılır;
+kullanıcı "Seslendir"e bastığında ses büyük olasılıkla hazırdır.
+Kullanım: python precompute.py backfill [--batch-size 32]   (mevcut tüm kelimeler için)
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+
+from dotenv import load_dotenv
+
+# PRECOMPUTE_* ve TTS_* ayarları import anında okunur; .env önce yüklenir
+load_dotenv()
+
+import sound
+
+# Sayfalar FLAC istediği için önbelleğe bu formatta yazılır (WAV da yan ürün olarak önbellekte kalır)
+PRECOMPUTE_FORMAT = os.getenv("PRECOMPUTE_FORMAT", "flac")
+# Bekleyen iş sınırı; dolduğunda yeni işler atlanır (en iyi çaba)
+PRECOMPUTE_QUEUE_SIZE = int(os.getenv("PRECOMPUTE_QUEUE_SIZE", 256))
+# TTS kuyruğu doluysa kaç kez tekrar denenir
+PRECOMPUTE_RETRIES = int(os.getenv("PRECOMPUTE_RETRIES", 5))
+
+_jobs = queue.Queue(maxsize=PRECOMPUTE_QUEUE_SIZE)
+_lock = threading.Lock()
+_pid = None
+
+
+def _ensure_worker():
+    # Tek worker => arka planda aynı anda en fazla bir toplu sentez (sınırlı eşzamanlılık)
+    global _jobs, _pid
+    if _pid == os.getpid():
+        return
+    with _lock:
+        if _pid != os.getpid():
+            _jobs = queue.Queue(maxsize=PRECOMPUTE_QUEUE_SIZE)
+            threading.Thread(target=_worker, name="tts-precompute", daemon=True).start()
+            _pid = os.getpid()
+
+
+def _worker():
+    while True:
+        texts = _jobs.get()
+        try:
+            precompute(texts)
+        except Exception as e:
+            print(f"Precompute error: {e}")
+
+
+def precompute(texts):
+    """Metinleri düşük öncelikle sentezler; TTS kuyruğu doluysa bekleyip tekrar dener."""
+    for attempt in range(PRECOMPUTE_RETRIES + 1):
+        try:
+            sound.synthesize_many(texts, PRECOMPUTE_FORMAT, priority=sound.PRIORITY_BACKGROUND)
+            return True
+        except sound.TTSBusyError as e:
+            if attempt == PRECOMPUTE_RETRIES:
+                print(f"Precompute skipped, TTS busy: {len(texts)} texts")
+                return False
+            time.sleep(e.retry_after)
+
+
+def schedule(texts):
+    """Metinleri arka plan kuyruğuna ekler; kuyruk doluysa atlar. Beklemez."""
+    texts = [t for t in dict.fromkeys(t.strip() for t in texts if t) if t]
+    if not texts:
+        return False
+    _ensure_worker()
+    try:
+        _jobs.put_nowait(texts)
+        return True
+    except queue.Full:
+        print("Precompute queue full, skipping")
+        return False
+
+
+def schedule_entry(word, info, examples):
+    """Yeni kaydedilen kelime için: kelime, lemması ve (başarıyla üretilmiş) örnek cümleler."""
+    texts = [word, (info or {}).get("lemma", "")]
+    texts += [ex["sentence"] for ex in examples or [] if "turkish" in ex]
+    return schedule(texts)
+
+
+def backfill(db, batch_size=32):
+    """Mevcut tüm word_entries kelimeleri için sesleri sırayla üretir (senkron)."""
+    done = 0
+    after_id = 0
+    while True:
+        rows = db.list_entry_words(after_id=after_id, limit=batch_size)
+        if not rows:
+            break
+        after_id = rows[-1]["id"]
+        precompute([row["word"] for row in rows])
+        done += len(rows)
+        print(f"🔊 {done} kelime işlendi")
+    return done
+
+
+def main():
+    from database import Database
+
+    parser = argparse.ArgumentParser(description="Pronunciation audio precompute")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--batch-size", type=int, default=sound.TTS_BATCH_SIZE)
+    args = parser.parse_args()
+
+    total = backfill(Database(), args.batch_size)
+    print(f"✅ Backfill tamamlandı: {total} kelime")
+
+
+if __name__ == "__main__":
+    main()
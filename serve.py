@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Üretim sunucusu: modeller (analyzer, çeviri, TTS) ana süreçte bir kez yüklenir, ardından gunicorn
+WEB_WORKERS adet worker süreci fork eder. Model ağırlıkları copy-on-write ile paylaşılır; her worker
+WEB_THREADS thread ile istek karşılar.
+Kullanım: python serve.py [--bind 0.0.0.0:8080] [--workers 4] [--threads 4]
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# WEB_* ve modüllerin ayarları import anında okunur; .env önce yüklenir
+load_dotenv()
+
+# Warmup fork öncesinde senkron yapılır; app import edilirken arka plan thread'i başlatılmasın
+# (thread'ler fork'ta çocuk süreçlere geçmez)
+os.environ["WARMUP_ON_START"] = "0"
+
+from gunicorn.app.base import BaseApplication
+
+WEB_BIND = os.getenv("WEB_BIND", "0.0.0.0:8080")
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", os.cpu_count() or 1))
+WEB_THREADS = int(os.getenv("WEB_THREADS", 4))
+WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", 120))
+
+
+def _torch_threads(workers):
+    # Çekirdekler worker'lar arasında bölünür; TORCH_NUM_THREADS verilirse o kullanılır
+    value = os.getenv("TORCH_NUM_THREADS")
+    return int(value) if value else max(1, (os.cpu_count() or 1) // workers)
+
+
+def preload():
+    """Uygulamayı import eder ve tüm modelleri yükler; hata varsa fork etmeden çıkar."""
+    import sound
+    import translate
+    import warmup
+
+    # OpenMP thread havuzu fork'a güvenli değildir: ana süreçte torch tek thread'le çalışır,
+    # her worker post_fork'ta kendi thread sayısını ayarlar
+    sound.TORCH_NUM_THREADS = translate.TORCH_NUM_THREADS = "1"
+    from app import app
+
+    report = warmup.warmup_all()
+    failed = {name: info["error"] for name, info in report.items() if info["status"] != "ready"}
+    if failed:
+        print(f"❌ Warmup başarısız: {failed}")
+        sys.exit(1)
+    return app
+
+
+def post_fork(server, worker):
+    import sound
+    import translate
+    # Worker'da sonradan yüklenen modeller (ör. fast çeviri modu) ana süreçteki tek thread ayarını devralmasın
+    sound.TORCH_NUM_THREADS = translate.TORCH_NUM_THREADS = os.getenv("TORCH_NUM_THREADS")
+    if "torch" not in sys.modules:
+        return  # model sunucusu istemcisi: worker'da torch yok
+    import torch
+    torch.set_num_threads(_torch_threads(server.cfg.workers))
+
+
+class WordMasterServer(BaseApplication):
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WordMaster production server")
+    parser.add_argument("--bind", default=WEB_BIND)
+    parser.add_argument("--workers", type=int, default=WEB_WORKERS)
+    parser.add_argument("--threads", type=int, default=WEB_THREADS)
+    parser.add_argument("--timeout", type=int, default=WEB_TIMEOUT)
+    args = parser.parse_args()
+
+    options = {
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "timeout": args.timeout,
+        "preload_app": True,
+        "post_fork": post_fork,
+    }
+    print(f" WordMaster AI üretim modunda: {args.bind} ({args.workers} worker x {args.threads} thread)")
+    WordMasterServer(preload(), options).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import threading
+
+#Bu modül aynı anahtarla eşzamanlı gelen çağrıları tek bir hesaplamada birleştirir
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için devam eden bir hesaplama varsa yeni çağıranlar onu bekler ve
+    aynı sonucu (ya da aynı hatayı) paylaşır. Hesaplama bitince anahtar serbest kalır;
+    sonuçları saklamaz, önbelleğin yerini tutmaz.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
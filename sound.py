@@ -1,9 +1,18 @@
-import torch
-from transformers import SpeechT5Processor, SpeechT5ForTextToSpeech, SpeechT5HifiGan
 import io
+import itertools
+import os
+import queue
+import threading
 import numpy as np
 import soundfile as sf
+from concurrent.futures import Future
 from functools import lru_cache
+import model_server
+from cache import FileStore, make_key
+from singleflight import SingleFlight
+
+# torch/transformers yalnızca sentez gerektiğinde import edilir;
+# önbellekten karşılanan istekler için torch hiç yüklenmez
 
 # Modelleri tembel (lazy) yükleyelim ki import sırasında bloklamasın
 _processor = None
@@ -11,15 +20,124 @@ _model = None
 _vocoder = None
 _speaker_embedding = None
 
+# Ses/model sürümü: model, konuşmacı ya da son işleme değişirse artırılmalı (eski önbellek geçersiz olur)
+VOICE_VERSION = "speecht5_tts+speecht5_hifigan/seed42/v1"
+
+# Desteklenen çıktı formatları: format -> (soundfile format, subtype, mimetype)
+AUDIO_FORMATS = {
+    "wav": ("WAV", None, "audio/wav"),
+    "flac": ("FLAC", "PCM_16", "audio/flac"),
+    "ogg": ("OGG", "VORBIS", "audio/ogg"),
+}
+
+# Diskte içerik adresli ses önbelleği: yeniden başlatmalardan sonra da kalır, tüm worker'lar paylaşır.
+# Dosya adları <hash>.<format> şeklindedir (anahtarın sonundaki uzantı).
+audio_store = FileStore(
+    root=os.getenv("TTS_CACHE_DIR", "tts_cache"),
+    max_bytes=int(os.getenv("TTS_CACHE_MAX_MB", 512)) * 1024 * 1024,
+)
+
+# synthesize_many'de tek model geçişinde sentezlenecek en fazla metin sayısı
+TTS_BATCH_SIZE = int(os.getenv("TTS_BATCH_SIZE", 16))
+
+# Ayrı çıkarım (inference) worker'ları: torch Flask thread'lerinde değil, sınırlı sayıda worker'da çalışır
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", 1))
+# Kuyruk doluysa yeni istekler beklemeden reddedilir (503 + Retry-After)
+TTS_QUEUE_SIZE = int(os.getenv("TTS_QUEUE_SIZE", 32))
+TTS_RETRY_AFTER = int(os.getenv("TTS_RETRY_AFTER", 2))
+# Verilirse torch intra-op thread sayısı sabitlenir; verilmezse çekirdekler worker'lara bölünür
+TORCH_NUM_THREADS = os.getenv("TORCH_NUM_THREADS")
+
+_load_lock = threading.Lock()
+
+
+class TTSBusyError(RuntimeError):
+    """TTS kuyruğu dolu; istemci retry_after saniye sonra tekrar denemeli."""
+
+    def __init__(self, retry_after=TTS_RETRY_AFTER):
+        super().__init__("TTS queue is full")
+        self.retry_after = retry_after
+
+
+# Kuyruk öncelikleri: kullanıcı istekleri arka plan (önceden hesaplama) işlerinin önüne geçer
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class _InferenceExecutor:
+    """
+    Sabit sayıda worker thread ve sınırlı öncelikli kuyruk. Kuyruk doluysa submit beklemeden TTSBusyError
+    fırlatır, böylece yük altında gecikme sınırlı kalır. Arka plan işleri kuyruğun yalnızca yarısını
+    doldurabilir; kalan kapasite kullanıcı isteklerine ayrılır.
+    Worker'lar ilk işte (ve fork sonrası her süreçte) başlatılır.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self._queue = queue.PriorityQueue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._seq = itertools.count()  # aynı öncelikte FIFO sırası
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.PriorityQueue(maxsize=self._queue.maxsize)
+                for i in range(self.workers):
+                    threading.Thread(target=self._worker, name=f"tts-worker-{i}", daemon=True).start()
+                self._pid = os.getpid()
+
+    def _worker(self):
+        while True:
+            _, _, future, fn, args = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn, *args, priority=PRIORITY_INTERACTIVE):
+        self._ensure_started()
+        if priority != PRIORITY_INTERACTIVE and self._queue.qsize() >= self._queue.maxsize // 2:
+            raise TTSBusyError()
+        future = Future()
+        try:
+            self._queue.put_nowait((priority, next(self._seq), future, fn, args))
+        except queue.Full:
+            raise TTSBusyError()
+        return future
+
+    def queued(self):
+        return self._queue.qsize()
+
+
+_executor = _InferenceExecutor(TTS_WORKERS, TTS_QUEUE_SIZE)
+
+def _run_inference(fn, *args, priority=PRIORITY_INTERACTIVE):
+    return _executor.submit(fn, *args, priority=priority).result()
+
+# Aynı metin için eşzamanlı istekler tek bir sentez sonucunu paylaşır
+_flights = SingleFlight()
+
 def _ensure_models_loaded():
     global _processor, _model, _vocoder, _speaker_embedding
-    if _processor is None:
+    if _speaker_embedding is not None:
+        return
+    # Eşzamanlı ilk istekler modeli aynı anda iki kez yüklemesin
+    with _load_lock:
+        if _speaker_embedding is not None:
+            return
+        import torch
+        from transformers import SpeechT5Processor, SpeechT5ForTextToSpeech, SpeechT5HifiGan
+        torch.set_num_threads(
+            int(TORCH_NUM_THREADS) if TORCH_NUM_THREADS else max(1, (os.cpu_count() or 1) // TTS_WORKERS)
+        )
         _processor = SpeechT5Processor.from_pretrained("microsoft/speecht5_tts")
-    if _model is None:
         _model = SpeechT5ForTextToSpeech.from_pretrained("microsoft/speecht5_tts")
-    if _vocoder is None:
         _vocoder = SpeechT5HifiGan.from_pretrained("microsoft/speecht5_hifigan")
-    if _speaker_embedding is None:
         # Deterministic speaker embedding for consistent voice
         torch.manual_seed(42)
         _speaker_embedding = torch.randn(1, 512)
@@ -27,16 +145,37 @@ def _ensure_models_loaded():
 def _normalize_text(text: str) -> str:
      return (text or "").strip()
 
-@lru_cache(maxsize=256)
+def _tts_text(text_norm: str) -> str:
+    # For very short tokens (e.g., "go"), end punctuation helps articulation
+    return text_norm if len(text_norm) > 2 else f"{text_norm}."
+
 def _synthesize_core(text_norm: str) -> bytes:
+    import torch
     _ensure_models_loaded()
-    # For very short tokens (e.g., "go"), end punctuation helps articulation
-    tts_text = text_norm if len(text_norm) > 2 else f"{text_norm}."
-    inputs = _processor(text=tts_text, return_tensors="pt")
+    inputs = _processor(text=_tts_text(text_norm), return_tensors="pt")
     with torch.no_grad():
         speech = _model.generate_speech(inputs["input_ids"], _speaker_embedding, vocoder=_vocoder)
 
-    waveform = speech.cpu().numpy()  # shape: (T,)
+    return _to_wav_bytes(speech.cpu().numpy())  # shape: (T,)
+
+def _synthesize_batch(texts_norm) -> list:
+    """Birden fazla metni tek bir SpeechT5 + HiFi-GAN geçişinde sentezler (padding + attention mask)."""
+    import torch
+    _ensure_models_loaded()
+    inputs = _processor(text=[_tts_text(t) for t in texts_norm], return_tensors="pt", padding=True)
+    with torch.no_grad():
+        speech, lengths = _model.generate_speech(
+            inputs["input_ids"],
+            _speaker_embedding.repeat(len(texts_norm), 1),
+            attention_mask=inputs["attention_mask"],
+            vocoder=_vocoder,
+            return_output_lengths=True,
+        )
+    # Çıktılar en uzun olana göre doldurulmuş; her birini kendi uzunluğuna kırp
+    speech = speech.cpu().numpy()
+    return [_to_wav_bytes(speech[i, :int(length)]) for i, length in enumerate(lengths)]
+
+def _to_wav_bytes(waveform) -> bytes:
     if waveform.ndim > 1:
         waveform = waveform.squeeze()
 
@@ -59,10 +198,69 @@ def _synthesize_core(text_norm: str) -> bytes:
     buffer.seek(0)
     return buffer.read()
 
-def synthesize_wav_bytes(text: str) -> bytes:
-    """Verilen metnin WAV ses verisini bytes olarak döndürür (16kHz, mono). Sonuçlar cache'lenir."""
+def _audio_key(text_norm: str, fmt: str) -> str:
+    return f"{make_key('tts', VOICE_VERSION, text_norm)}.{fmt}"
+
+def _transcode(wav_bytes: bytes, fmt: str) -> bytes:
+    # WAV'i sıkıştırılmış formata çevirir; model gerekmez
+    sf_format, subtype, _ = AUDIO_FORMATS[fmt]
+    waveform, sr = sf.read(io.BytesIO(wav_bytes), dtype="float32")
+    buffer = io.BytesIO()
+    sf.write(buffer, waveform, sr, format=sf_format, subtype=subtype)
+    return buffer.getvalue()
+
+@lru_cache(maxsize=256)
+def _cached_audio(text_norm: str, fmt: str) -> bytes:
+    # Katmanlar: süreç içi LRU (bu fonksiyon) -> disk önbelleği -> model (WAV) / dönüştürme (diğerleri)
+    key = _audio_key(text_norm, fmt)
+    audio = audio_store.get(key)
+    if audio is None:
+        if fmt == "wav" and model_server.enabled():
+            # Model sunucusu modunda yerel CPU kullanılmaz: RPC doğrudan çağrılır, eşzamanlı istekler
+            # sunucuda tek geçişte birleştirilir (yerel TTS_WORKERS kuyruğu bunları sıraya dizerdi)
+            audio = model_server.synthesize([text_norm])[0]
+        elif fmt == "wav":
+            audio = _run_inference(_synthesize_core, text_norm)
+        else:
+            audio = _transcode(_cached_audio(text_norm, "wav"), fmt)
+        audio_store.put(key, audio)
+    return audio
+
+def synthesize_audio_bytes(text: str, fmt: str = "wav") -> bytes:
+    """Verilen metnin sesini istenen formatta (wav, flac, ogg) döndürür (16kHz, mono). Sonuçlar cache'lenir."""
+    if fmt not in AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format: {fmt}")
     text_norm = _normalize_text(text)
     if not text_norm:
         return b""
-    return _synthesize_core(text_norm)
+    return _flights.do((text_norm, fmt), _cached_audio, text_norm, fmt)
+
+def synthesize_wav_bytes(text: str) -> bytes:
+    """Verilen metnin WAV ses verisini bytes olarak döndürür (16kHz, mono). Sonuçlar cache'lenir."""
+    return synthesize_audio_bytes(text, "wav")
+
+def synthesize_many(texts, fmt: str = "wav", priority=PRIORITY_INTERACTIVE) -> list:
+    """
+    Metin listesinin seslerini girdi sırasıyla döndürür. Önbellekte (disk) olmayanlar
+    TTS_BATCH_SIZE'lık partiler halinde tek model geçişinde sentezlenir; her öğe ayrı önbelleğe yazılır.
+    """
+    if fmt not in AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format: {fmt}")
+    normalized = [_normalize_text(t) for t in texts]
+    unique = [t for t in dict.fromkeys(normalized) if t]
+
+    missing = [
+        t for t in unique
+        if not audio_store.contains(_audio_key(t, fmt)) and not audio_store.contains(_audio_key(t, "wav"))
+    ]
+    for start in range(0, len(missing), TTS_BATCH_SIZE):
+        chunk = missing[start:start + TTS_BATCH_SIZE]
+        if model_server.enabled():
+            audios = model_server.synthesize(chunk)
+        else:
+            audios = _run_inference(_synthesize_batch, chunk, priority=priority)
+        for text_norm, audio in zip(chunk, audios):
+            audio_store.put(_audio_key(text_norm, "wav"), audio)
 
+    # Artık hepsi diskte: bellek/disk önbelleği üzerinden (gerekirse dönüştürülerek) döner
+    return [synthesize_audio_bytes(t, fmt) if t else b"" for t in normalized]
@@ -0,0 +1,13 @@
+from cache import TieredCache
+
+
+def test_get_returns_a_copy(tmp_path):
+    cache = TieredCache(str(tmp_path / "cache.db"), "items")
+    cache.set("k", {"v": 1})
+    cache.get("k")["v"] = 999
+    assert cache.get("k") == {"v": 1}
+
+    # Diskten okunan değer de bellekteki kopyayı değiştirmez
+    disk = TieredCache(str(tmp_path / "cache.db"), "items")
+    disk.get("k")["v"] = 999
+    assert disk.get("k") == {"v": 1}
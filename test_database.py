@@ -0,0 +1,130 @@
+import pytest
+
+import database
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / "wordmaster.db"))
+
+
+def test_migrations_are_recorded(db):
+    assert db.schema_version() == Database.MIGRATIONS[-1][0]
+    assert db.migrate() == []
+
+
+def test_skipped_migration_is_not_recorded(tmp_path, monkeypatch):
+    latest = Database.MIGRATIONS[-1][0]
+    monkeypatch.setattr(Database, "MIGRATIONS", [*Database.MIGRATIONS, (99, "optional", lambda self, conn: False)])
+    db = Database(str(tmp_path / "wordmaster.db"))
+    assert db.schema_version() == latest
+    assert db.migrate() == []
+
+
+def test_hot_queries_do_not_full_scan(db):
+    results = db.check_query_plans()
+    assert set(results) == set(db.hot_queries())
+    for name, result in results.items():
+        assert not result["full_scan"], f"{name}: {' | '.join(result['plan'])}"
+
+
+def test_unbounded_match_is_a_full_scan():
+    assert database._is_full_scan("SCAN word_entries_search VIRTUAL TABLE INDEX 0:M1")
+    assert not database._is_full_scan("SCAN word_entries_search VIRTUAL TABLE INDEX 0:M1><")
+
+
+def test_word_search_matches_like(db, monkeypatch):
+    monkeypatch.setattr(database, "FTS_MIN_USER_WORDS", 0)
+    words = ["Running", "singing", "sing", "walked", "ring", "string theory", "İstanbul", "a_b", "100%"]
+    for email in ("a@example.com", "b@example.com"):
+        user_id = db.create_user(email, "password")["user_id"]
+        db.add_word_entries_bulk(user_id, words)
+
+    with db._connection() as conn:
+        assert db._use_word_search(conn, user_id, "ing")
+    searches = ["ING", "a_b", "00%"]
+    found = [db.list_user_words(user_id, search=search) for search in searches]
+    db.word_search = False
+    assert found == [db.list_user_words(user_id, search=search) for search in searches]
+    assert sorted(row["word"] for row in found[0]) == ["Running", "ring", "sing", "singing", "string theory"]
+    # LIKE joker karakterleri harfiyen aranır
+    assert [row["word"] for row in found[1]] == ["a_b"]
+    assert [row["word"] for row in found[2]] == ["100%"]
+
+
+def test_page_cursors_walk_rows_with_equal_created_at(db):
+    user_id = db.create_user("pages@example.com", "password")["user_id"]
+    # Toplu ekleme tüm satırlara aynı created_at'i verir; sıra id ile belirlenir
+    db.add_word_entries_bulk(user_id, [f"word{i}" for i in range(7)])
+
+    def words(page):
+        return [row["word"] for row in page["words"]]
+
+    first = db.list_user_words_page(user_id, per_page=3)
+    assert words(first) == ["word6", "word5", "word4"]
+    assert first["prev_cursor"] is None
+
+    second = db.list_user_words_page(user_id, per_page=3, after=first["next_cursor"])
+    assert words(second) == ["word3", "word2", "word1"]
+    third = db.list_user_words_page(user_id, per_page=3, after=second["next_cursor"])
+    assert words(third) == ["word0"]
+    assert third["next_cursor"] is None
+
+    back = db.list_user_words_page(user_id, per_page=3, before=third["prev_cursor"])
+    assert words(back) == words(second)
+    start = db.list_user_words_page(user_id, per_page=3, before=back["prev_cursor"])
+    assert words(start) == words(first)
+    assert start["prev_cursor"] is None
+
+
+def test_invalid_cursor_falls_back_to_first_page(db):
+    user_id = db.create_user("cursor@example.com", "password")["user_id"]
+    db.add_word_entries_bulk(user_id, [f"word{i}" for i in range(5)])
+
+    first = db.list_user_words_page(user_id, per_page=2)
+    for token in ("not-a-cursor", "bm90IGpzb24", ""):
+        assert db.list_user_words_page(user_id, per_page=2, after=token) == first
+        assert db.list_user_words_page(user_id, per_page=2, before=token) == first
+
+
+def test_hobby_word_duplicates_are_removed_by_migration(tmp_path, monkeypatch):
+    path = str(tmp_path / "wordmaster.db")
+    migrations = Database.MIGRATIONS
+    # v3 öncesi şema: unique index yok, aynı (hobby, word) birden çok kez eklenebiliyordu
+    monkeypatch.setattr(Database, "MIGRATIONS", migrations[:2])
+    old = Database(path)
+    with old._connection() as conn:
+        conn.executemany(
+            "INSERT INTO hobby_words (hobby, word, definition, level) VALUES (?, ?, ?, ?)",
+            [("music", "tempo", "old", "b1"), ("music", "tempo", "new", "b2"), ("music", "chord", "x", "a2"),
+             ("sports", "tempo", "y", "b1")],
+        )
+        conn.commit()
+
+    monkeypatch.setattr(Database, "MIGRATIONS", migrations)
+    db = Database(path)
+    with db._connection() as conn:
+        rows = conn.execute("SELECT hobby, word, definition FROM hobby_words ORDER BY hobby, word").fetchall()
+    assert rows == [("music", "chord", "x"), ("music", "tempo", "new"), ("sports", "tempo", "y")]
+
+
+def test_save_hobby_words_upserts_and_refreshes_cache(db):
+    def count():
+        with db._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM hobby_words").fetchone()[0]
+
+    words = [{"word": "tempo", "definition": "speed", "level": "b1"}]
+    db.save_hobby_words("music", words)
+    db.save_hobby_words("music", words)
+    assert count() == 1
+    assert [w["word"] for w in db.get_hobby_words("music")] == ["tempo"]
+
+    # Kayıttan hemen sonra önbellekteki eski liste değil yeni satırlar görünür
+    db.save_hobby_words("music", [{"word": "tempo", "definition": "pace", "level": "b2"},
+                                  {"word": "chord", "definition": "notes", "level": "a2"}])
+    assert count() == 2
+    saved = {w["word"]: w for w in db.get_hobby_words("music")}
+    assert set(saved) == {"tempo", "chord"}
+    assert saved["tempo"]["definition"] == "pace"
+    assert [w["word"] for w in db.get_hobby_words("music", level="b2")] == ["tempo"]
@@ -1,22 +1,124 @@
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+import os
+import threading
+import unicodedata
+import model_server
+from cache import TieredCache, make_key
+
+# torch/transformers yalnızca model yerelde yüklenirken import edilir;
+# model sunucusu kullanan (MODEL_SERVER_SOCKET) worker'lar torch'u hiç yüklemez
 
-# Modeli ve tokenizer'ı yükle
 model_name = "ckartal/english-to-turkish-finetuned-model"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-translator = AutoModelForSeq2SeqLM.from_pretrained(model_name)
 
+# Çeviri modları:
+# - quality: tam hassasiyet + beam search (varsayılan)
+# - fast: dinamik int8 quantization + greedy/küçük beam (yoğun trafikli CPU node'ları için)
+TRANSLATE_MODES = {
+    "quality": {
+        "quantize": False,
+        "generate": {
+            "max_length": 100,  # çıktı uzunluğu
+            "num_beams": 4,  # beam search ile daha iyi sonuç
+            "early_stopping": True,
+        },
+    },
+    "fast": {
+        "quantize": True,
+        "generate": {
+            "max_length": 100,
+            "num_beams": int(os.getenv("TRANSLATE_FAST_BEAMS", 1)),  # 1 => greedy
+        },
+    },
+}
+TRANSLATE_MODE = os.getenv("TRANSLATE_MODE", "quality")
+if TRANSLATE_MODE not in TRANSLATE_MODES:
+    raise ValueError(f"Unknown TRANSLATE_MODE: {TRANSLATE_MODE}")
 
-def translate_tur(sentence):
-    inputs = tokenizer(sentence, return_tensors="pt")
+# Verilirse torch intra-op thread sayısı sabitlenir (ör. node başına çekirdek / worker sayısı)
+TORCH_NUM_THREADS = os.getenv("TORCH_NUM_THREADS")
+
+# Modeller tembel yüklenir; açılışta warmup.py diğer modellerle paralel olarak yükler
+_models = {}  # mode -> (tokenizer, model)
+_load_lock = threading.Lock()
+
+# Çeviri önbelleği: wordmaster.db'nin yanında ayrı bir SQLite dosyası, tüm worker'lar paylaşır
+translation_cache = TieredCache(
+    db_path=os.getenv("TRANSLATION_CACHE_DB", "translation_cache.db"),
+    table="translations",
+    max_entries=int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", 100000)),
+    memory_entries=int(os.getenv("TRANSLATION_CACHE_MEMORY_ENTRIES", 2048)),
+)
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def _cache_key(text_norm: str, mode: str) -> str:
+    # Model, mod veya decoding parametreleri değişirse eski çeviriler otomatik olarak geçersiz olur
+    return make_key("translate", model_name, TRANSLATE_MODES[mode], text_norm)
+
+
+def translate_tur(sentence, mode=None):
+    return translate_tur_batch([sentence], mode=mode)[0]
 
-    # Çeviri üret
-    outputs = translator.generate(
-        **inputs,
-        max_length=100,  # çıktı uzunluğu
-        num_beams=4,  # beam search ile daha iyi sonuç
-        early_stopping=True
-    )
-    turkish = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    return turkish
 
+def translate_tur_batch(sentences, mode=None):
+    """Cümle listesini çevirir; önbellekte olmayanlar tek bir batch generate çağrısıyla üretilir."""
+    mode = mode or TRANSLATE_MODE
+    normalized = [_normalize_text(s) for s in sentences]
+    if not normalized:
+        return []
 
+    keys = [_cache_key(s, mode) for s in normalized]
+    cached = translation_cache.get_many(keys)
+
+    # Aynı cümle batch içinde birden fazla kez geçse bile bir kez çevrilir
+    pending = {}
+    for key, text in zip(keys, normalized):
+        if key not in cached and text:
+            pending.setdefault(key, text)
+
+    if pending:
+        translated = dict(zip(pending, _translate_uncached(list(pending.values()), mode)))
+        translation_cache.set_many(translated)
+        cached.update(translated)
+
+    return [cached.get(key, "") for key in keys]
+
+
+def _ensure_model_loaded(mode=None):
+    mode = mode or TRANSLATE_MODE
+    if mode in _models:
+        return _models[mode]
+    with _load_lock:
+        if mode not in _models:
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+            if TORCH_NUM_THREADS:
+                torch.set_num_threads(int(TORCH_NUM_THREADS))
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            translator = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+            translator.eval()
+            if TRANSLATE_MODES[mode]["quantize"]:
+                # Linear katmanları int8'e çevrilir; CPU'da daha hızlı ve daha az bellek
+                translator = torch.ao.quantization.quantize_dynamic(
+                    translator, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            _models[mode] = (tokenizer, translator)
+    return _models[mode]
+
+
+def _translate_uncached(sentences, mode=None):
+    mode = mode or TRANSLATE_MODE
+    if model_server.enabled():
+        # Model paylaşılan sunucuda; diğer worker'ların istekleriyle aynı batch'te çevrilir
+        return model_server.translate(sentences, mode)
+    import torch
+    tokenizer, translator = _ensure_model_loaded(mode)
+    # Farklı uzunluktaki cümleler için padding gerekli
+    inputs = tokenizer(sentences, return_tensors="pt", padding=True)
+
+    # Çeviri üret
+    with torch.inference_mode():
+        outputs = translator.generate(**inputs, **TRANSLATE_MODES[mode]["generate"])
+    return tokenizer.batch_decode(outputs, skip_special_tokens=True)
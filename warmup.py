@@ -0,0 +1,115 @@
+import threading
+import time
+
+#Bu modül ağır modelleri açılışta paralel olarak yükler ve hazır olma durumunu tutar
+
+
+def _load_translator():
+    import model_server
+    if model_server.enabled():
+        # Modeller paylaşılan sunucuda; yerelde yüklemek yerine sunucunun hazır olması beklenir
+        model_server.wait_ready()
+        return
+    import translate
+    translate._ensure_model_loaded()
+
+
+def _load_tts():
+    import model_server
+    if model_server.enabled():
+        model_server.wait_ready()
+        return
+    import sound
+    # Modeli yükler ve önbelleği atlayarak bir kez çalıştırır; ilk gerçek istek soğuk başlangıç maliyeti ödemez
+    sound._synthesize_core("hello")
+
+
+def _load_tagger():
+    import analyzer
+    analyzer.get_tagger().tag(analyzer.tokenize("Warm up the tagger."))
+
+
+def _load_wordnet():
+    import analyzer
+    analyzer.get_lemmatizer().lemmatize("words")
+
+
+def _load_wordindex():
+    import wordindex
+    # İndeksi mmap ile açar; dosya yoksa hazır olma kontrolü başarısız olur (istek sırasında derlenmez)
+    wordindex.is_english_word("words")
+
+
+WARMUP_TASKS = {
+    "translator": _load_translator,
+    "tts": _load_tts,
+    "tagger": _load_tagger,
+    "wordnet": _load_wordnet,
+    "wordindex": _load_wordindex,
+}
+
+_state = {name: {"status": "pending", "seconds": None, "error": None} for name in WARMUP_TASKS}
+_state_lock = threading.Lock()
+_started = False
+
+
+def _run_task(name, loader):
+    with _state_lock:
+        _state[name]["status"] = "loading"
+    start = time.perf_counter()
+    try:
+        loader()
+        status, error = "ready", None
+    except Exception as e:
+        status, error = "failed", str(e)
+    elapsed = round(time.perf_counter() - start, 3)
+    with _state_lock:
+        _state[name].update(status=status, seconds=elapsed, error=error)
+    if error:
+        print(f" {name} warmup hatası ({elapsed}s): {error}")
+    else:
+        print(f" {name} hazır ({elapsed}s)")
+
+
+def warmup_all():
+    """Tüm modelleri paralel thread'lerde yükler, bitene kadar bekler ve raporu döndürür."""
+    global _started
+    with _state_lock:
+        _started = True
+    return _run_all()
+
+
+def _run_all():
+    threads = [
+        threading.Thread(target=_run_task, args=(name, loader), name=f"warmup-{name}", daemon=True)
+        for name, loader in WARMUP_TASKS.items()
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f" Warmup tamamlandı ({time.perf_counter() - start:.2f}s)")
+    return report()
+
+
+def start_background():
+    """Warmup'ı arka planda başlatır; sunucu bu sırada istek kabul etmeye devam eder."""
+    global _started
+    with _state_lock:
+        if _started:
+            return None
+        _started = True
+    t = threading.Thread(target=_run_all, name="warmup", daemon=True)
+    t.start()
+    return t
+
+
+def report():
+    with _state_lock:
+        return {name: dict(info) for name, info in _state.items()}
+
+
+def is_ready():
+    with _state_lock:
+        return all(info["status"] == "ready" for info in _state.values())
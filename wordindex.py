@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+İngilizce kelime geçerlilik indeksi.
+WordNet lemma adları ve istisna (düzensiz çekim) formlarından önceden derlenmiş, sıralı ikili bir dosya.
+Dosya mmap ile açılır ve ikili arama yapılır: WordNet yüklenmez, tüm worker'lar aynı sayfa önbelleğini paylaşır.
+Dosya biçimi: MAGIC | kelime sayısı (uint32) | n+1 ofset (uint32) | UTF-8 kelimeler art arda
+Kullanım: python wordindex.py build   (indeksi yeniden derler; python nltk_setup.py de derler)
+"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+from nltk.corpus.reader.wordnet import WordNetCorpusReader
+from nltk.stem import PorterStemmer
+import nltk_setup  # sabit NLTK veri dizinini arama yoluna ekler
+
+INDEX_VERSION = 2
+MAGIC = b"WIDX%04d" % INDEX_VERSION
+INDEX_PATH = os.getenv(
+    "ENGLISH_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "english_index.bin"),
+)
+
+# WordNet'in morphy() fonksiyonunun kullandığı ek kuralları (tüm türler için tek liste)
+_SUBSTITUTIONS = sorted({
+    rule for rules in WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS.values() for rule in rules
+})
+
+_porter = PorterStemmer()
+_index = None
+_load_lock = threading.Lock()
+
+
+def build_index(path=INDEX_PATH):
+    """WordNet'ten indeksi derler ve sıralı ikili dosya olarak diske yazar; kelime sayısını döndürür."""
+    from nltk.corpus import wordnet as wn
+
+    entries = {name.lower() for name in wn.all_lemma_names()}
+    # Düzensiz çekimler (went -> go, mice -> mouse) morphy'de istisna dosyalarından gelir
+    for fileid in ("noun.exc", "verb.exc", "adj.exc", "adv.exc"):
+        with wn.open(fileid) as f:
+            for line in f:
+                parts = line.split()
+                if parts:
+                    entries.add(parts[0].lower())
+
+    # UTF-8 bayt sırası = kod noktası sırası; arama baytlar üzerinde yapılır
+    words = sorted(entry.encode("utf-8") for entry in entries)
+    offsets = [0]
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(words)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(words))
+    os.replace(tmp_path, path)  # diğer worker'lar yarım yazılmış dosya görmesin
+    return len(words)
+
+
+class _Index:
+    """mmap edilmiş indeks üzerinde ikili arama; bellekte kopya tutulmaz."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise LookupError(f"English word index at {path} is outdated. Run 'python wordindex.py build'")
+        self.count = struct.unpack_from("<I", self._mm, len(MAGIC))[0]
+        self._offsets = len(MAGIC) + 4
+        self._words = self._offsets + 4 * (self.count + 1)
+
+    def _word(self, i):
+        start, end = struct.unpack_from("<2I", self._mm, self._offsets + 4 * i)
+        return self._mm[self._words + start:self._words + end]
+
+    def __contains__(self, form):
+        key = form.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            word = self._word(mid)
+            if word < key:
+                lo = mid + 1
+            elif word > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+
+def index_ready(path=INDEX_PATH):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _get_index():
+    global _index
+    if _index is not None:
+        return _index
+    with _load_lock:
+        if _index is None:
+            # İstek sırasında WordNet'ten derlenmez: kurulum adımı eksikse ensure_resources gibi hata verilir
+            if not os.path.exists(INDEX_PATH):
+                raise LookupError(
+                    f"English word index not found at {INDEX_PATH}. "
+                    f"Run 'python nltk_setup.py' (or 'python wordindex.py build') to create it"
+                )
+            _index = _Index(INDEX_PATH)
+    return _index
+
+
+def _known(form, index):
+    # wn.synsets(form) ile aynı mantık: kelimenin kendisi, istisna formu ya da ek kuralıyla bulunan kök
+    if form in index:
+        return True
+    for old, new in _SUBSTITUTIONS:
+        if form.endswith(old) and form[:len(form) - len(old)] + new in index:
+            return True
+    return False
+
+
+def is_english_word(word: str) -> bool:
+    """Kelime (ya da Porter kökü) WordNet'te bir karşılığa sahipse True döner."""
+    form = (word or "").strip().lower().replace(" ", "_")
+    if not form:
+        return False
+    index = _get_index()
+    return _known(form, index) or _known(_porter.stem(form), index)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        count = build_index(INDEX_PATH)
+        print(f"✅ {count} kelime indekslendi: {INDEX_PATH}")
+    else:
+        print("Kullanım: python wordindex.py build")